@@ -0,0 +1,154 @@
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import chess
+from common import Bitbase, BITBASE_PATH
+
+# The strong side is always white here, see Bitbase for the table layout
+UNRESOLVED = 255
+KING_STEPS = [[target for target in chess.SQUARES if chess.square_distance(square, target) == 1] for square in chess.SQUARES]
+DIRECTIONS = {
+    chess.ROOK: [(1, 0), (-1, 0), (0, 1), (0, -1)],
+    chess.QUEEN: [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)],
+}
+
+def build_rays():
+    """For every slider and square, list the squares of each ray in order of distance."""
+    rays = {}
+    for piece_type, directions in DIRECTIONS.items():
+        rays[piece_type] = []
+        for square in chess.SQUARES:
+            square_rays = []
+            for file_step, rank_step in directions:
+                ray = []
+                file, rank = chess.square_file(square) + file_step, chess.square_rank(square) + rank_step
+                while 0 <= file < 8 and 0 <= rank < 8:
+                    ray.append(chess.square(file, rank))
+                    file, rank = file + file_step, rank + rank_step
+                square_rays.append(ray)
+            rays[piece_type].append(square_rays)
+    return rays
+
+RAYS = build_rays()
+# BETWEEN[piece_type][square][target] is the mask of squares in between, missing when the slider cannot reach the target
+BETWEEN = {piece_type: [{ray[index]: sum(chess.BB_SQUARES[between] for between in ray[:index]) for ray in square_rays for index in range(len(ray))}
+                        for square_rays in rays] for piece_type, rays in RAYS.items()}
+PAWN_ATTACKS = [set(chess.SquareSet(chess.BB_PAWN_ATTACKS[chess.WHITE][square])) for square in chess.SQUARES]
+
+def attacks(piece_type, piece, target, blocker):
+    """Does the white piece attack the target, with the strong king as the only possible blocker?"""
+    if piece_type == chess.PAWN:
+        return target in PAWN_ATTACKS[piece]
+    between = BETWEEN[piece_type][piece].get(target)
+    return between is not None and not between & chess.BB_SQUARES[blocker]
+
+def valid(piece_type, strong_king, weak_king, piece):
+    if len({strong_king, weak_king, piece}) < 3 or chess.square_distance(strong_king, weak_king) < 2:
+        return False
+    return piece_type != chess.PAWN or 1 <= chess.square_rank(piece) <= 6
+
+def weak_moves(piece_type, strong_king, weak_king, piece):
+    """Count the legal moves of the lone king (capturing an undefended piece included)."""
+    count = 0
+    for target in KING_STEPS[weak_king]:
+        if chess.square_distance(target, strong_king) < 2:
+            continue
+        if target == piece or not attacks(piece_type, piece, target, strong_king):
+            count += 1
+    return count
+
+def strong_unmoves(piece_type, strong_king, weak_king, piece):
+    """Yield the strong-to-move positions that lead to the given weak-to-move position."""
+    for origin in KING_STEPS[strong_king]:
+        if origin != piece and chess.square_distance(origin, weak_king) > 1 and not attacks(piece_type, piece, weak_king, origin):
+            yield Bitbase.index(True, origin, weak_king, piece)
+    if piece_type == chess.PAWN:
+        origins = [piece - 8]
+        if chess.square_rank(piece) == 3 and piece - 8 not in (strong_king, weak_king):
+            origins.append(piece - 16)
+        for origin in origins:
+            if chess.square_rank(origin) >= 1 and origin not in (strong_king, weak_king) and not attacks(piece_type, origin, weak_king, strong_king):
+                yield Bitbase.index(True, strong_king, weak_king, origin)
+        return
+    for ray in RAYS[piece_type][piece]:
+        for origin in ray:
+            if origin in (strong_king, weak_king):
+                break
+            if not attacks(piece_type, origin, weak_king, strong_king):
+                yield Bitbase.index(True, strong_king, weak_king, origin)
+
+def weak_unmoves(piece_type, strong_king, weak_king, piece):
+    """Yield the weak-to-move positions that lead to the given strong-to-move position."""
+    for origin in KING_STEPS[weak_king]:
+        if origin != piece and chess.square_distance(origin, strong_king) > 1:
+            yield Bitbase.index(False, strong_king, origin, piece)
+
+def generate(piece_type, tables):
+    """Retrograde analysis: start from the mates and walk the positions back ply by ply."""
+    distance = bytearray([UNRESOLVED]) * Bitbase.SIZE
+    counts = bytearray(Bitbase.SIZE)
+    buckets = defaultdict(list)
+
+    for strong_king in chess.SQUARES:
+        for weak_king in chess.SQUARES:
+            for piece in chess.SQUARES:
+                if not valid(piece_type, strong_king, weak_king, piece):
+                    continue
+                in_check = attacks(piece_type, piece, weak_king, strong_king)
+                index = Bitbase.index(False, strong_king, weak_king, piece)
+                counts[index] = weak_moves(piece_type, strong_king, weak_king, piece)
+                if not counts[index] and in_check:
+                    buckets[0].append(index)  # Mate
+                # A pawn on the seventh rank promotes into the already generated tables
+                if piece_type == chess.PAWN and not in_check and chess.square_rank(piece) == 6 and piece + 8 not in (strong_king, weak_king):
+                    for promotion in (chess.QUEEN, chess.ROOK):
+                        value = tables[promotion][Bitbase.index(False, strong_king, weak_king, piece + 8)]
+                        if value and (value - 1) % 2 == 0:
+                            buckets[value].append(Bitbase.index(True, strong_king, weak_king, piece))
+
+    plies = 0
+    while buckets:
+        for index in buckets.pop(plies, []):
+            if distance[index] != UNRESOLVED:
+                continue
+            distance[index] = plies
+            weak_to_move, rest = divmod(index, 64 * 64 * 64)
+            strong_king, rest = divmod(rest, 64 * 64)
+            weak_king, piece = divmod(rest, 64)
+            if weak_to_move:
+                for previous in strong_unmoves(piece_type, strong_king, weak_king, piece):
+                    if distance[previous] == UNRESOLVED:
+                        buckets[plies + 1].append(previous)
+            else:
+                for previous in weak_unmoves(piece_type, strong_king, weak_king, piece):
+                    if distance[previous] == UNRESOLVED:
+                        counts[previous] -= 1
+                        if not counts[previous]:
+                            buckets[plies + 1].append(previous)  # Every escape loses, the slowest one now
+        plies += 1
+
+    return bytes(0 if value == UNRESOLVED else value + 1 for value in distance)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the KQK, KRK and KPK endgame tables for Czess.")
+    parser.add_argument("-o", "--output", default=os.path.abspath(BITBASE_PATH), help="output file")
+    args = parser.parse_args()
+
+    tables = {}
+    for piece_type in (chess.QUEEN, chess.ROOK, chess.PAWN):
+        start = time.perf_counter()
+        tables[piece_type] = generate(piece_type, tables)
+        wins = sum(1 for value in tables[piece_type] if value and (value - 1) % 2)
+        print(f"K{chess.piece_symbol(piece_type).upper()}K: {wins} won positions, "
+              f"longest mate {max(tables[piece_type]) - 1} plies, {time.perf_counter() - start:.1f}s")
+
+    Bitbase(tables).save(args.output)
+    print(f"Bitbases have been saved to: {args.output} ({os.path.getsize(args.output)} bytes)")
+
+if __name__ == "__main__":
+    main()
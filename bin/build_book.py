@@ -0,0 +1,85 @@
+import argparse
+import os
+import struct
+from collections import defaultdict
+
+import chess
+import chess.pgn
+import chess.polyglot
+
+ENTRY = struct.Struct(">QHHI")  # Polyglot entry: key, move, weight, learn
+PROMOTIONS = {chess.KNIGHT: 1, chess.BISHOP: 2, chess.ROOK: 3, chess.QUEEN: 4}
+
+def encode_move(board, move):
+    """Encode a move the Polyglot way, castling is stored as the king taking its own rook."""
+    to_square = move.to_square
+    if board.is_castling(move) and not board.chess960:
+        rook_file = 7 if board.is_kingside_castling(move) else 0
+        to_square = chess.square(rook_file, chess.square_rank(move.from_square))
+    return (chess.square_file(to_square) | chess.square_rank(to_square) << 3
+            | chess.square_file(move.from_square) << 6 | chess.square_rank(move.from_square) << 9
+            | PROMOTIONS.get(move.promotion, 0) << 12)
+
+def find_pgn_files(paths):
+    """Yield every .pgn file among the given files and directories."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith(".pgn"):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+def collect(paths, max_ply):
+    """Stream the games and score every (position, move) pair: 2 for a win, 1 for a draw."""
+    weights = defaultdict(int)
+    games = 0
+    for path in find_pgn_files(paths):
+        with open(path, encoding="utf-8", errors="replace") as pgn:
+            while True:
+                game = chess.pgn.read_game(pgn)
+                if game is None:
+                    break
+                result = game.headers.get("Result", "*")
+                if result not in ("1-0", "0-1", "1/2-1/2"):
+                    continue
+                games += 1
+                board = game.board()
+                for ply, move in enumerate(game.mainline_moves()):
+                    if ply >= max_ply:
+                        break
+                    if result == "1/2-1/2":
+                        score = 1
+                    else:
+                        score = 2 if (result == "1-0") == (board.turn == chess.WHITE) else 0
+                    if score:
+                        weights[(chess.polyglot.zobrist_hash(board), encode_move(board, move))] += score
+                    board.push(move)
+        print(f"{path}: {games} games so far, {len(weights)} entries")
+    return weights
+
+def write_book(weights, output, min_weight):
+    """Write the entries sorted by key, weights scaled down to fit into 16 bits."""
+    entries = [(key, move, weight) for (key, move), weight in weights.items() if weight >= min_weight]
+    scale = max((weight for _, _, weight in entries), default=0) / 0xFFFF
+    entries.sort(key=lambda entry: (entry[0], -entry[2]))
+    with open(output, "wb") as book:
+        for key, move, weight in entries:
+            scaled = int(weight / scale) if scale > 1 else weight
+            book.write(ENTRY.pack(key, move, max(1, scaled), 0))
+    print(f"Book with {len(entries)} entries has been saved to: {output}")
+
+def main():
+    base_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    parser = argparse.ArgumentParser(description="Build a Polyglot opening book for Czess from local PGN files.")
+    parser.add_argument("pgn", nargs="+", help="PGN files or directories with PGN files")
+    parser.add_argument("-o", "--output", default=os.path.join(base_dir, "assets", "book.bin"), help="output book file")
+    parser.add_argument("--max-ply", type=int, default=20, help="how many plies of each game go into the book")
+    parser.add_argument("--min-weight", type=int, default=2, help="drop moves with a lower total score")
+    args = parser.parse_args()
+
+    write_book(collect(args.pgn, args.max_ply), args.output, args.min_weight)
+
+if __name__ == "__main__":
+    main()
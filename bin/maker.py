@@ -56,6 +56,19 @@ def locate_linuxdeploy(base_dir):
     
     return linuxdeploy_path
 
+def locate_data_files(base_dir):
+    """Return --add-data arguments for the endgame tables and the opening book.
+       The game finds them in the 'assets' folder next to the bundled sources."""
+    arguments = []
+    for name in ("bitbases.bin", "book.bin"):
+        path = os.path.join(base_dir, "assets", name)
+        if os.path.isfile(path):
+            print(f"{name} found at: {path}")
+            arguments += ["--add-data", path + ":assets"]
+        else:
+            print(f"{name} not found in the assets directory, the build will play without it.")
+    return arguments
+
 def build_exe(base_dir, icon_path):
     """Build an EXE using PyInstaller's Python API."""
     executable_dir = os.path.join(base_dir, "executable")  # Output EXE in the 'executable' folder
@@ -75,6 +88,8 @@ def build_exe(base_dir, icon_path):
             "--add-data", os.path.join(base_dir, "src/lan_multiplayer_server.py") + ":.",
             "--add-data", os.path.join(base_dir, "src/local_multiplayer.py") + ":.",
             "--add-data", os.path.join(base_dir, "src/singleplayer.py") + ":.",
+            "--add-data", os.path.join(base_dir, "src/search_board.py") + ":.",
+            *locate_data_files(base_dir),
             "--distpath", executable_dir,
             "--workpath", os.path.join(executable_dir, "build"),
             "--specpath", executable_dir,
@@ -111,8 +126,10 @@ def build_appimage(base_dir, linuxdeploy_path):
             "--add-data", os.path.join(base_dir, "src/lan_multiplayer_server.py") + ":.",
             "--add-data", os.path.join(base_dir, "src/local_multiplayer.py") + ":.",
             "--add-data", os.path.join(base_dir, "src/singleplayer.py") + ":.",
+            "--add-data", os.path.join(base_dir, "src/search_board.py") + ":.",
             "--add-data", os.path.join(base_dir, "src/capture.mp3") + ":.",
             "--add-data", os.path.join(base_dir, "src/move-sound.mp3") + ":.",
+            *locate_data_files(base_dir),
             "--distpath", executable_dir,
             "--workpath", os.path.join(executable_dir, "build"),
             "--specpath", executable_dir,
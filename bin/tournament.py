@@ -0,0 +1,176 @@
+import argparse
+import ast
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import chess
+import chess.pgn
+from common import AI, MOVE_BUDGETS
+
+# Short balanced lines, every one is played twice with the colours swapped
+OPENINGS = [
+    "e2e4 e7e5 g1f3 b8c6 f1b5 a7a6",
+    "e2e4 e7e5 g1f3 b8c6 f1c4 f8c5",
+    "e2e4 c7c5 g1f3 d7d6 d2d4 c5d4",
+    "e2e4 c7c5 b1c3 b8c6",
+    "e2e4 e7e6 d2d4 d7d5",
+    "e2e4 c7c6 d2d4 d7d5",
+    "d2d4 d7d5 c2c4 e7e6",
+    "d2d4 d7d5 c2c4 c7c6",
+    "d2d4 g8f6 c2c4 e7e6 b1c3 f8b4",
+    "d2d4 g8f6 c2c4 g7g6 b1c3 f8g7",
+    "c2c4 e7e5 b1c3 g8f6",
+    "g1f3 d7d5 g2g3 g8f6",
+]
+
+def parse_player(spec: str) -> tuple[str, dict]:
+    """Parse 'difficulty[:attribute=value,...]', e.g. 'Fales:null_move=False,time_limit=0.5'."""
+    difficulty, _, settings = spec.partition(":")
+    if difficulty not in MOVE_BUDGETS:
+        raise argparse.ArgumentTypeError(f"unknown difficulty {difficulty!r}, choose from {', '.join(MOVE_BUDGETS)}")
+    options = {}
+    for setting in filter(None, settings.split(",")):
+        name, _, value = setting.partition("=")
+        try:
+            options[name.strip()] = ast.literal_eval(value.strip())
+        except (ValueError, SyntaxError):
+            raise argparse.ArgumentTypeError(f"bad value in {setting!r}") from None
+    return difficulty, options
+
+def player_name(player: tuple[str, dict]) -> str:
+    difficulty, options = player
+    return ":".join([difficulty] + [",".join(f"{name}={value}" for name, value in options.items())] * bool(options))
+
+def load_openings(path: str | None) -> list[str]:
+    """One opening per line, either UCI moves from the start position or a FEN."""
+    if path is None:
+        return OPENINGS
+    with open(path, encoding="utf-8") as openings:
+        return [line.strip() for line in openings if line.strip() and not line.startswith("#")]
+
+def opening_board(opening: str) -> chess.Board:
+    if "/" in opening:
+        return chess.Board(opening)
+    board = chess.Board()
+    for move in opening.split():
+        board.push_uci(move)
+    return board
+
+def create_ai(color: bool, player: tuple[str, dict], book: bool) -> AI:
+    difficulty, options = player
+    ai = AI(color, difficulty, workers=1, **({} if book else {"book_path": None}))
+    for name, value in options.items():
+        if not hasattr(ai, name):
+            raise AttributeError(f"AI has no attribute {name!r}")
+        setattr(ai, name, value)
+    return ai
+
+def play_game(round_: int, opening: str, white: tuple[str, dict], black: tuple[str, dict], names: tuple[str, str],
+              max_plies: int, book: bool) -> tuple[int, str, str]:
+    """Play one game in a worker process, return (round, PGN text, result)."""
+    board = opening_board(opening)
+    players = {chess.WHITE: create_ai(chess.WHITE, white, book), chess.BLACK: create_ai(chess.BLACK, black, book)}
+    termination = None
+    try:
+        while True:
+            outcome = board.outcome()
+            if outcome:
+                result, termination = outcome.result(), outcome.termination.name.lower()
+                break
+            # Draw claims without is_game_over(claim_draw=True), which replays the whole game every ply
+            if board.is_repetition(3) or board.halfmove_clock >= 100:
+                result, termination = "1/2-1/2", "draw claim"
+                break
+            if board.ply() >= max_plies:
+                result, termination = "1/2-1/2", "adjudicated after move limit"
+                break
+            ai = players[board.turn]
+            ai.think(board.copy())
+            move, ai.result = ai.result, None
+            board.push(move)
+    finally:
+        for ai in players.values():
+            ai.close()
+
+    game = chess.pgn.Game.from_board(board)
+    game.headers.update({"Event": "Czess self-play", "Site": "?", "Round": str(round_), "White": names[0], "Black": names[1],
+                         "Result": result, "Termination": termination})
+    return round_, str(game), result
+
+def elo(wins: int, draws: int, losses: int) -> tuple[float, float]:
+    """Elo difference and its 95% error margin from the score of the first player."""
+    games = wins + draws + losses
+    score = (wins + draws / 2) / games
+    if score in (0, 1):
+        return math.copysign(math.inf, score - 0.5), math.inf
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    margin = 1.96 * math.sqrt(variance / games)
+    to_elo = lambda p: -400 * math.log10(1 / p - 1)
+    low, high = max(score - margin, 1e-9), min(score + margin, 1 - 1e-9)
+    return to_elo(score), (to_elo(high) - to_elo(low)) / 2
+
+def main():
+    parser = argparse.ArgumentParser(description="Play headless AI-vs-AI matches for Czess and report the Elo difference.")
+    parser.add_argument("player", type=parse_player, help="first player, 'difficulty[:attribute=value,...]'")
+    parser.add_argument("opponent", type=parse_player, help="second player in the same format")
+    parser.add_argument("-r", "--rounds", type=int, default=1, help="how many times to play through the openings (default: 1)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="games played at once (default: number of CPUs)")
+    parser.add_argument("--openings", help="file with one opening per line, UCI moves or a FEN (default: built-in set)")
+    parser.add_argument("--time", type=float, help="seconds per move for both players, overrides the difficulty budget")
+    parser.add_argument("--nodes", type=int, help="node limit per move for both players")
+    parser.add_argument("--max-plies", type=int, default=300, help="adjudicate a draw after this many plies (default: 300)")
+    parser.add_argument("--book", action="store_true", help="let the players use the opening book after the opening")
+    parser.add_argument("-o", "--output", default="tournament.pgn", help="PGN file the games are appended to")
+    args = parser.parse_args()
+
+    players = [args.player, args.opponent]
+    labels = [player_name(player) for player in players]
+    for _, options in players:
+        if args.time is not None:
+            options.setdefault("time_limit", args.time)
+        if args.nodes is not None:
+            options.setdefault("node_limit", args.nodes)
+    if labels[0] == labels[1]:
+        labels = [f"{labels[0]} #1", f"{labels[1]} #2"]
+
+    openings = load_openings(args.openings)
+    games = []
+    for _ in range(args.rounds):
+        for opening in openings:
+            games.append((opening, 0, 1))
+            games.append((opening, 1, 0))
+    print(f"{labels[0]} vs {labels[1]}: {len(games)} games on {args.jobs} processes")
+
+    wins = draws = losses = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.jobs) as executor, open(args.output, "a", encoding="utf-8") as pgn:
+        futures = {executor.submit(play_game, round_, opening, players[white], players[black], (labels[white], labels[black]),
+                                   args.max_plies, args.book): white
+                   for round_, (opening, white, black) in enumerate(games, 1)}
+        for future in as_completed(futures):
+            round_, text, result = future.result()
+            print(text, end="\n\n", file=pgn, flush=True)
+            if result == "1/2-1/2":
+                draws += 1
+            elif (result == "1-0") == (futures[future] == 0):
+                wins += 1
+            else:
+                losses += 1
+            played = wins + draws + losses
+            print(f"Game {round_:>4} {result:<7} | {played}/{len(games)} +{wins} ={draws} -{losses}")
+
+    difference, margin = elo(wins, draws, losses)
+    played = wins + draws + losses
+    print(f"Score of {labels[0]} vs {labels[1]}: +{wins} ={draws} -{losses} "
+          f"({(wins + draws / 2) / played:.1%}) in {time.perf_counter() - start:.0f}s")
+    print(f"Elo difference: {difference:+.1f} +/- {margin:.1f}")
+    print(f"Games have been saved to: {os.path.abspath(args.output)}")
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,111 @@
 import chess
 import pygame
+import numpy as np
 from typing import Dict
 import random
 import logging as log
 import chess.pgn
+import chess.polyglot
 import base64
+import multiprocessing
+import struct
+import threading
 import time
 import io
 import os
+import sys
+import zlib
+from collections import OrderedDict
+from multiprocessing import shared_memory
+from search_board import SearchBoard
+
+# Meze hodnocení pro alfa-beta, musí ležet mimo rozsah evaluate_board (±10000 za mat)
+INFINITY        = 1000000
+MATE_VALUE      = 100000
+MAX_DEPTH       = 64
+# Rozpočet na jeden tah podle obtížnosti: (sekundy, uzly), latence tahu je tím shora omezená
+MOVE_BUDGETS    = {"easy": (0.1, 1000), "medium": (0.1, 1000), "hard": (0.5, 5000), "Fales": (2.0, 200000)}
+BUDGET_CHECK    = 256  # Po kolika uzlech se kontroluje čas
+# Váhy pro řazení tahů, proměny a šachy jdou před ostatní braní
+PROMOTION_ORDER = 3000
+CHECK_ORDER     = 2000
+CAPTURE_ORDER   = 1000
+ORDER_VALUES    = {chess.PAWN: 1, chess.KNIGHT: 3, chess.BISHOP: 3, chess.ROOK: 5, chess.QUEEN: 9, chess.KING: 10}
+TT_MOVE_ORDER   = 10000
+KILLER_ORDER    = 900  # Pod braními, druhý zabiják o jedna níž, zbylé tiché tahy řadí historie
+# Hodnoty pro statickou výměnu (SEE), král je "nevyměnitelný"
+SEE_VALUES      = {chess.PAWN: 1, chess.KNIGHT: 3, chess.BISHOP: 3, chess.ROOK: 5, chess.QUEEN: 9, chess.KING: 100}
+# Hodnocení pozice v setinách pěšce: materiál a tabulka podle řady (PST), z pohledu AI
+PAWN_VALUE      = 100
+PIECE_VALUES    = {chess.PAWN: 100, chess.KNIGHT: 300, chess.BISHOP: 300, chess.ROOK: 500, chess.QUEEN: 900, chess.KING: 0}
+PIECE_SQUARE_VALUES = {
+    chess.PAWN:   [0, 0, 0, 0, 0, 0, 0, 0],
+    chess.KNIGHT: [-500, -400, -300, -300, -300, -300, -400, -500],
+    chess.BISHOP: [-400, -200, -100, -100, -100, -100, -200, -400],
+    chess.ROOK:   [-200, -100, 0, 0, 0, 0, -100, -200],
+    chess.QUEEN:  [-100, 0, 0, 0, 0, 0, 0, -100],
+    chess.KING:   [0, 100, 100, 300, 300, 100, 100, 0],
+}
+# Materiál + PST pro každé pole, aby přírůstkové hodnocení bylo jen sčítání
+SQUARE_SCORES   = {piece_type: [PIECE_VALUES[piece_type] + PIECE_SQUARE_VALUES[piece_type][square // 8] for square in chess.SQUARES]
+                   for piece_type in PIECE_VALUES}
+# Pěšcová struktura (z pohledu strany s pěšci): postih za zdvojené a izolované pěšce,
+# bonus za volného pěšce podle řady od vlastní strany a za pěšce ve štítu krále
+DOUBLED_PAWN    = -25
+ISOLATED_PAWN   = -25
+PASSED_PAWN     = (0, 0, 10, 15, 25, 50, 75, 0)
+PAWN_SHIELD     = 10
+PAWN_HASH_SIZE  = 1 << 14  # Záznamů v tabulce pěšcové struktury (mocnina dvou)
+ADJACENT_FILES  = [(chess.BB_FILES[file - 1] if file > 0 else 0) | (chess.BB_FILES[file + 1] if file < 7 else 0) for file in range(8)]
+# PASSED_MASKS[barva][pole]: pole před pěšcem na jeho a sousedních sloupcích, kde nesmí stát soupeřův pěšec
+PASSED_MASKS    = [[(sum(chess.BB_RANKS[chess.square_rank(square) + 1:]) if color == chess.WHITE else sum(chess.BB_RANKS[:chess.square_rank(square)]))
+                    & (chess.BB_FILES[chess.square_file(square)] | ADJACENT_FILES[chess.square_file(square)]) for square in chess.SQUARES]
+                   for color in (chess.BLACK, chess.WHITE)]
+# SHIELD_MASKS[barva][pole krále]: dvě řady před králem na první nebo druhé řadě, jinde štít nepočítáme
+SHIELD_MASKS    = [[PASSED_MASKS[color][square] & sum(chess.BB_RANKS[rank] for rank in range(8) if abs(rank - chess.square_rank(square)) <= 2)
+                    if chess.square_rank(square) in ((0, 1) if color == chess.WHITE else (6, 7)) else 0 for square in chess.SQUARES]
+                   for color in (chess.BLACK, chess.WHITE)]
+# Aktivita figur, váhy v šestnáctinách pěšce: bezpečná pole v dosahu a pole v okolí soupeřova krále v dosahu
+MOBILITY_WEIGHTS   = {chess.KNIGHT: 2, chess.BISHOP: 2, chess.ROOK: 1, chess.QUEEN: 1}
+KING_ATTACK_WEIGHT = 3
+ACTIVITY_SCALE     = 16
+LAZY_MARGIN        = 300  # Aktivita se nepočítá, když je pozice o tolik mimo okno alfa-beta (|aktivita| je v 98 % pozic nejvýš 300)
+# Dávkové hodnocení: pozice jako 12 rovin 64 polí (typ - 1 pro bílé, typ + 5 pro černé), váhy z pohledu bílého.
+# PLANE_INDEX převádí kód figury (typ | barva << 3, jako v SearchBoard) na rovinu
+PLANE_INDEX     = np.array([(code & 7) - 1 + (0 if code >> 3 == chess.WHITE else 6) if 1 <= code & 7 <= 6 else 0 for code in range(16)], dtype=np.intp)
+PLANE_WEIGHTS   = np.array([SQUARE_SCORES[piece_type] for piece_type in chess.PIECE_TYPES] +
+                           [[-value for value in SQUARE_SCORES[piece_type]] for piece_type in chess.PIECE_TYPES], dtype=np.int32)
+# Výběrové prohledávání, každá technika jde v AI vypnout (viz test/selective_benchmark.py)
+NULL_MOVE            = True
+NULL_MOVE_REDUCTION  = 2
+NULL_MOVE_MIN_DEPTH  = 3
+LATE_MOVE_REDUCTIONS = True
+LMR_MIN_DEPTH        = 3
+LMR_FULL_MOVES       = 3          # Kolik prvních tahů v uzlu se nikdy neredukuje
+FUTILITY_PRUNING     = True
+FUTILITY_MARGINS     = (0, 200, 400)  # Podle zbývající hloubky, v setinách pěšce
+CHECK_EXTENSIONS     = True
+# Transpoziční tabulka
+TT_SIZE_MB      = 16
+TT_EXACT        = 1  # Přesná hodnota
+TT_LOWER        = 2  # Hodnota je alespoň taková (beta řez)
+TT_UPPER        = 3  # Hodnota je nejvýše taková (žádný tah nepřekonal alfu)
+# Složka s daty, ve spustitelném souboru z bin/maker.py je rozbalená v sys._MEIPASS
+ASSETS_PATH     = os.path.join(getattr(sys, "_MEIPASS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")), "assets")
+# Zahajovací knihovna ve formátu Polyglot, vytváří ji bin/build_book.py
+BOOK_PATH       = os.path.join(ASSETS_PATH, "book.bin")
+# Tabulky koncovek KQK, KRK a KPK, vytváří je bin/build_bitbases.py
+BITBASE_PATH    = os.path.join(ASSETS_PATH, "bitbases.bin")
+# Paralelní prohledávání (Lazy SMP), 1 = jen vlákno hlavního procesu
+SEARCH_WORKERS  = 1
+
+# Výchozí logger pro použití bez init_game (pomocné procesy, skripty), init_game ho přepíše
+logger = log.getLogger(__name__)
+# Statistiky každého hledání jako strukturovaný záznam: handler je najde v record.search_stats
+search_logger = log.getLogger(f"{__name__}.search")
+
+class SearchTimeout(Exception):
+    """Vyhozena uvnitř prohledávání, když dojde rozpočet času nebo uzlů."""
 
 class Game:
     def __init__(self, screen: pygame.Surface, board: chess.Board, images: dict[str, str]) -> None:
@@ -20,6 +118,8 @@ class Game:
         self.move_num  = 1
         self.images    = images
         self.screen    = screen
+        self.renderer  = BoardRenderer(screen, images)
+        self.animating = False  # Běží časovač ANIMATION_EVENT pro stavový řádek
 
         # Předání zvukového souboru hráčům při jejich inicializaci
         self.move_sound = pygame.mixer.Sound(io.BytesIO(base64.b64decode(ASSETS["move-sound"])))
@@ -28,7 +128,12 @@ class Game:
         self.players["white"].set_move_sound(self.move_sound)
         self.players["black"].set_move_sound(self.move_sound)
 
-    def loop(self, events: tuple[pygame.event.Event, ...], multiplayer=None) -> None:
+    def loop(self, events: tuple[pygame.event.Event, ...], multiplayer=None) -> list[pygame.Rect]:
+        """Odehraje snímek hry a vrátí obdélníky, které se změnily, pro pygame.display.update(rects)."""
+        for event in events:
+            if event.type in REDRAW_EVENTS:
+                self.renderer.invalidate()
+        rects = []
         if not self.game_end:
             if multiplayer == "client":
                 if self.board.turn == chess.BLACK:
@@ -45,15 +150,20 @@ class Game:
                 else:
                     self.players["black"].on_move(self.board, events)
                     self.game_state = "On turn: Black"
-            
-            draw_board(self.board, self.screen, (self.players["white"], self.players["black"]), self.images)
+                for player in self.players.values():
+                    if isinstance(player, AI) and player.color != self.board.turn:
+                        player.ponder(self.board)  # Přemýšlí během tahu soupeře
+                thinking = [player for player in self.players.values() if getattr(player, "thinking", False)]
+                if thinking:
+                    self.game_state = f"{get_color(thinking[0].color).capitalize()} is thinking" + "." * (int(time.time() * 2) % 3 + 1)
+                self.animate(bool(thinking))
 
-            if self.board.outcome() != None:
-                self.game_state = f"Game ended: {self.board.outcome().result}"
+            outcome = self.board.outcome()
+            if outcome != None:
+                self.game_state = f"Game ended: {outcome.result}"
                 self.game_end_menu.state = self.game_state
                 self.game_end = True
 
-            self.screen.blit(FONT.render(self.game_state, True, FONT_COLOR), (710,0))
             try:
                 if self.board.peek() != self.last_move:
                     self.last_move = self.board.peek()
@@ -61,7 +171,21 @@ class Game:
                     self.move_num += 1
             except IndexError:
                 pass
-            print_game_log(self.screen, self.moves)
+            rects = self.renderer.draw(self.board, (self.players["white"], self.players["black"]), self.game_state, self.moves)
+        return rects
+
+    def animate(self, animating: bool) -> None:
+        """Zapne nebo vypne časovač, který budí smyčku kvůli teček u "is thinking"."""
+        if animating != self.animating:
+            pygame.time.set_timer(ANIMATION_EVENT, 500 if animating else 0)
+            self.animating = animating
+
+    def stop(self) -> None:
+        """Ukončí výpočty hráčů běžící na pozadí, volat před opuštěním hry."""
+        self.animate(False)
+        for player in self.players.values():
+            if isinstance(player, AI):
+                player.close()
 
 
 class Player:
@@ -118,38 +242,565 @@ class Player:
 
 
 
+class BoardLayer:
+    """Obrázek šachovnice i s figurami. Skládá se z piece_map, jen když se pozice změní,
+    snímek pak celou šachovnici vykreslí jedním blitem."""
+    def __init__(self, images: Dict[str, pygame.Surface]) -> None:
+        self.images  = images
+        self.surface = images["chess_board"].copy()
+        self.key     = None  # Bitboardy nakreslené pozice
+        self.pieces  = {}    # Nakreslené figury podle polí
+
+    def update(self, board: chess.Board) -> set[int]:
+        """Překreslí vrstvu, pokud se figury pohnuly, a vrátí pole, na kterých se něco změnilo."""
+        key = (board.occupied_co[chess.WHITE], board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings)
+        if key == self.key:
+            return set()
+        pieces  = board.piece_map()
+        changed = {square for square in pieces.keys() | self.pieces.keys() if pieces.get(square) != self.pieces.get(square)}
+        self.surface.blit(self.images["chess_board"], (0, 0))
+        for square, piece in pieces.items():
+            draw_piece(piece, self.surface, (chess.square_file(square), 7 - chess.square_rank(square)), self.images)
+        self.key, self.pieces = key, pieces
+        return changed
+
+
+class TextCache:
+    """LRU cache vykreslených textů podle (text, font, barva). Po překročení velikosti
+    vypadne nejdéle nepoužitý povrch, paměť je tak omezená počtem položek."""
+    def __init__(self, size: int) -> None:
+        self.size     = size
+        self.surfaces = OrderedDict()
+        self.hits     = 0
+        self.misses   = 0
+
+    def render(self, font: pygame.font.Font, text: str, color: tuple[int, int, int], antialias: bool = True) -> pygame.Surface:
+        key = (text, font, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+
+class MoveLog:
+    """Posledních 15 tahů složených do jednoho povrchu, skládá se znovu jen po změně Game.moves."""
+    LINES = 15
+
+    def __init__(self) -> None:
+        self.key     = None  # (počet tahů, poslední tah) složeného záznamu
+        self.surface = None
+
+    def update(self, moves: Dict[int, chess.Move]) -> bool:
+        """Vrátí True, pokud se povrch musel složit znovu."""
+        key = (len(moves), next(reversed(moves.values()), None))
+        if key == self.key:
+            return False
+        lines = [f"{index}. {move.uci()}" for index, move in list(moves.items())[-self.LINES:]] or ["No moves"]
+        texts = [render_text(FONT, line, FONT_COLOR) for line in lines]
+        self.surface = pygame.Surface((max(text.get_width() for text in texts), len(texts) * (FONT_SIZE + 5)))
+        self.surface.fill(EGGSHELL)  # Neprůhledný podklad, průhledný povrch by antialiasing zdvojil
+        for line, text in enumerate(texts):
+            self.surface.blit(text, (0, line * (FONT_SIZE + 5)))
+        self.key = key
+        return True
+
+
+class BoardRenderer:
+    """Kreslí hru po změnách: pamatuje si, co je na každém poli a ve stavovém řádku nakresleno,
+    a překreslí jen to, co se od minulého snímku liší. Při nečinnosti nevrací žádné obdélníky."""
+    def __init__(self, screen: pygame.Surface, images: Dict[str, pygame.Surface]) -> None:
+        self.screen     = screen
+        self.images     = images
+        self.layer      = BoardLayer(images)
+        self.overlays   = {}  # Nakreslené překryvy polí
+        self.status     = None  # Nakreslený stavový řádek a jeho obdélník
+        self.status_rect = None
+        self.move_log   = MoveLog()
+        self.redraw_all = True
+
+    def invalidate(self) -> None:
+        """Příští snímek překreslí celou obrazovku (první snímek, změna okna, menu přes hru)."""
+        self.redraw_all = True
+
+    def draw(self, board: chess.Board, players: tuple[Player, Player], status: str, moves: Dict[int, chess.Move]) -> list[pygame.Rect]:
+        rects = []
+        if self.redraw_all:
+            self.layer.update(board)
+            self.screen.fill(EGGSHELL)
+            self.screen.blit(self.layer.surface, (0, 0))
+            self.overlays = {}
+            self.status   = None
+            self.move_log.update(moves)
+            self.screen.blit(self.move_log.surface, (710, FONT_SIZE + 5))
+            self.redraw_all = False
+            rects.append(self.screen.get_rect())
+
+        changed  = self.layer.update(board)
+        overlays = selection_overlays(board, players)
+        changed |= {square for square in overlays.keys() | self.overlays.keys() if overlays.get(square) != self.overlays.get(square)}
+        for square in changed:
+            rects.append(draw_square(self.screen, square, self.layer, overlays.get(square)))
+        self.overlays = overlays
+
+        if status != self.status:
+            if self.status_rect:
+                self.screen.fill(EGGSHELL, self.status_rect)
+            text = render_text(FONT, status, FONT_COLOR)
+            rect = self.screen.blit(text, (710, 0))
+            rects.append(rect.union(self.status_rect) if self.status_rect else rect)
+            self.status, self.status_rect = status, rect
+
+        if self.move_log.update(moves):
+            area = pygame.Rect(700, FONT_SIZE + 5, self.screen.get_width() - 700, MoveLog.LINES * (FONT_SIZE + 5))
+            self.screen.fill(EGGSHELL, area)
+            self.screen.blit(self.move_log.surface, (710, FONT_SIZE + 5))
+            rects.append(area)
+        return rects
+
+
+class Menu:
+    """Společný základ menu v režimu retained.
+
+    Pozadí s titulkem a stíny možností se vykreslí jednou pro danou velikost okna a obdélníky
+    možností se zapamatují pro kreslení i klikání. draw kreslí jen po změně výběru nebo velikosti
+    (jinak vrátí prázdný seznam obdélníků). Potomci nastaví fonty a barvy a podle potřeby přepíší
+    option_center, option_color, help_color a draw_background."""
+    title  = None
+    help_y = 1.07  # Střed nápovědy je na výšce height / help_y
+
+    def __init__(self, options: list[str], help_texts: list[str] | None = None) -> None:
+        self.options         = options
+        self.help_texts      = help_texts or []
+        self.selected_option = 0  # Index aktuálně vybrané možnosti
+        self.font_title      = pygame.font.Font(None, 64)
+        self.font_option     = pygame.font.Font(None, 50)
+        self.font_help       = pygame.font.Font(None, 30)
+        self.shadow_color    = (128, 119, 97)
+        self.highlight_color = (187, 250, 245)
+        self.font_color      = (130, 179, 175)
+        self.background_color = (222, 210, 177)
+        self.size       = None  # Velikost okna, pro kterou platí rozložení
+        self.background = None  # Pozadí s titulkem a stíny možností
+        self.rects      = []    # Obdélníky možností
+        self.drawn      = None  # (velikost, výběr) naposledy vykresleného menu
+
+    def invalidate(self) -> None:
+        """Příští draw znovu složí pozadí a překreslí celé menu."""
+        self.size  = None
+        self.drawn = None
+
+    def option_center(self, index: int, width: int, height: int) -> tuple[float, float]:
+        spacing = height // (len(self.options) + 1) * 0.5  # Mezera mezi možnostmi podle výšky okna
+        return width // 2, height // 2 + index * spacing
+
+    def option_color(self, index: int) -> tuple[int, int, int]:
+        return self.highlight_color if index == self.selected_option else self.font_color
+
+    def help_color(self) -> tuple[int, int, int]:
+        return self.font_color
+
+    def draw_background(self, surface: pygame.Surface, width: int, height: int) -> None:
+        surface.fill(self.background_color)
+        if self.title:
+            title_surface = render_text(self.font_title, self.title, self.font_color)
+            title_rect = title_surface.get_rect(center=(width // 2, height // 4))
+            surface.blit(render_text(self.font_title, self.title, self.shadow_color), title_rect.move(3, 3))  # Stín titulku
+            surface.blit(title_surface, title_rect)
+
+    def layout(self, width: int, height: int) -> None:
+        """Rozloží možnosti a složí pozadí, jen když se změnila velikost okna."""
+        if self.size == (width, height):
+            return
+        self.size  = (width, height)
+        self.rects = [render_text(self.font_option, option, self.font_color).get_rect(center=self.option_center(index, width, height))
+                      for index, option in enumerate(self.options)]
+        self.background = pygame.Surface((width, height))
+        self.draw_background(self.background, width, height)
+        if self.shadow_color:
+            for option, rect in zip(self.options, self.rects):
+                self.background.blit(render_text(self.font_option, option, self.shadow_color), rect.move(3, 3))
+        self.drawn = None
+
+    def draw(self, screen: pygame.Surface, width: int, height: int) -> list[pygame.Rect]:
+        """Vykreslí menu, pokud se od minula něco změnilo, a vrátí obdélníky pro pygame.display.update."""
+        self.layout(width, height)
+        if self.drawn == (self.size, self.selected_option):
+            return []
+        screen.blit(self.background, (0, 0))
+        if self.help_texts:
+            help_surface = render_text(self.font_help, self.help_texts[self.selected_option], self.help_color())
+            screen.blit(help_surface, help_surface.get_rect(center=(width // 2, height // self.help_y)))
+        for index, (option, rect) in enumerate(zip(self.options, self.rects)):
+            screen.blit(render_text(self.font_option, option, self.option_color(index)), rect)
+        self.drawn = (self.size, self.selected_option)
+        return [screen.get_rect()]
+
+    def move_selection(self, direction: int) -> None:
+        self.selected_option = (self.selected_option + direction) % len(self.options)
+
+    def option_at(self, pos: tuple[int, int]) -> int | None:
+        for index, rect in enumerate(self.rects):
+            if rect.collidepoint(pos):
+                return index
+        return None
+
+    def handle_input(self, events: tuple[pygame.event.Event, ...], width: int | None = None, height: int | None = None) -> int | str | None:
+        """Vrátí index potvrzené možnosti, "exit" při zavření okna, jinak None.
+        Myš se porovnává s obdélníky z posledního rozložení."""
+        if width is not None:
+            self.layout(width, height)
+        for event in events:
+            if event.type == pygame.QUIT:
+                log.info("Exiting")
+                return "exit"
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_UP:
+                    self.move_selection(-1)
+                elif event.key == pygame.K_DOWN:
+                    self.move_selection(1)
+                elif event.key == pygame.K_RETURN:
+                    return self.selected_option
+            if event.type == pygame.MOUSEMOTION:
+                index = self.option_at(event.pos)
+                if index is not None:
+                    self.selected_option = index
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                index = self.option_at(event.pos)
+                if index is not None:
+                    self.selected_option = index
+                    return index
+        return None
+
+
+class TranspositionTable:
+    """Transpoziční tabulka pevné velikosti klíčovaná Zobrist hashem pozice.
+
+    Každý index má dva sloty: první drží nejhlubší výsledek (depth-preferred),
+    druhý se přepisuje vždy (always-replace). Tabulka může ležet ve sdílené paměti,
+    procesy do ní zapisují bez zámků a roztržený záznam odhalí klíč uložený jako XOR s daty."""
+    ENTRY = struct.Struct("<QQ")  # klíč ^ data, data (hodnota, tah, hloubka, typ meze) = 16 bajtů
+
+    def __init__(self, size_mb: float = TT_SIZE_MB, shared: bool = False, name: str | None = None) -> None:
+        self.buckets = max(1, int(size_mb * 1024 * 1024) // (2 * self.ENTRY.size))
+        size         = self.buckets * 2 * self.ENTRY.size
+        self.owner   = shared and not name
+        self.shm     = None
+        if name:  # Připojení k tabulce, kterou vytvořil jiný proces
+            self.shm = shared_memory.SharedMemory(name=name)
+        elif shared:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.data    = self.shm.buf[:size] if self.shm else bytearray(size)
+        self.probes  = 0
+        self.hits    = 0
+
+    @property
+    def name(self) -> str | None:
+        return self.shm.name if self.shm else None
+
+    def probe(self, key: int) -> tuple[int, int, int, int] | None:
+        """Vrátí (hloubka, typ meze, hodnota, nejlepší tah) uložené pro pozici, nebo None.
+
+        Tah je zabalený jako v encode_move, 0 znamená žádný tah."""
+        self.probes += 1
+        offset = (key % self.buckets) * 2 * self.ENTRY.size
+        for slot in (offset, offset + self.ENTRY.size):
+            checked_key, data = self.ENTRY.unpack_from(self.data, slot)
+            if data and checked_key ^ data == key:
+                self.hits += 1
+                score = data & 0xFFFFFFFF
+                if score >= 1 << 31:
+                    score -= 1 << 32
+                return data >> 48 & 0xFF, data >> 56, score, data >> 32 & 0xFFFF
+        return None
+
+    def store(self, key: int, depth: int, flag: int, score: int, move: int) -> None:
+        offset = (key % self.buckets) * 2 * self.ENTRY.size
+        checked_key, data = self.ENTRY.unpack_from(self.data, offset)
+        if data and checked_key ^ data != key and data >> 48 & 0xFF > depth:
+            offset += self.ENTRY.size  # Hlubší výsledek nepřepisujeme, jde do druhého slotu
+        data = score & 0xFFFFFFFF | move << 32 | depth << 48 | flag << 56
+        self.ENTRY.pack_into(self.data, offset, key ^ data, data)
+
+    def clear(self) -> None:
+        self.data[:] = bytes(len(self.data))
+
+    def close(self) -> None:
+        """Uvolní sdílenou paměť, vlastník ji zároveň smaže."""
+        if self.shm:
+            self.data.release()
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+            self.shm = None
+
+    def reset_stats(self) -> None:
+        self.probes = 0
+        self.hits   = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+
+class Bitbase:
+    """Koncovky silnější strany s jednou figurou (dáma, věž, pěšec) proti samotnému králi.
+
+    Pro každou pozici je jeden bajt: 0 = remíza nebo nelegální pozice, jinak počet půltahů do matu + 1.
+    Lichý počet půltahů znamená výhru strany na tahu, sudý její prohru. Pozice jsou
+    normalizované tak, že silnější strana je bílá (černá se zrcadlí podle horizontály)."""
+    MAGIC  = b"CZBB"
+    HEADER = struct.Struct("<BI")  # typ figury, délka komprimované tabulky
+    PIECES = (chess.QUEEN, chess.ROOK, chess.PAWN)
+    SIZE   = 2 * 64 * 64 * 64
+
+    def __init__(self, tables: dict[int, bytes]) -> None:
+        self.tables = tables
+
+    @staticmethod
+    def index(strong_to_move: bool, strong_king: int, weak_king: int, piece: int) -> int:
+        return ((0 if strong_to_move else 1) * 64 + strong_king) * 64 * 64 + weak_king * 64 + piece
+
+    @classmethod
+    def load(cls, path: str) -> "Bitbase":
+        tables = {}
+        with open(path, "rb") as file:
+            if file.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"Not a Czess bitbase file: {path}")
+            while header := file.read(cls.HEADER.size):
+                piece_type, length = cls.HEADER.unpack(header)
+                tables[piece_type] = zlib.decompress(file.read(length))
+        return cls(tables)
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as file:
+            file.write(self.MAGIC)
+            for piece_type, table in self.tables.items():
+                data = zlib.compress(bytes(table), 9)
+                file.write(self.HEADER.pack(piece_type, len(data)))
+                file.write(data)
+
+    def probe(self, board: chess.Board) -> tuple[int, int] | None:
+        """Vrátí (1 výhra / 0 remíza / -1 prohra strany na tahu, půltahy do matu), nebo None mimo tabulky."""
+        if chess.popcount(board.occupied) > 3 or board.castling_rights:
+            return None
+        pieces = board.occupied & ~board.kings
+        if not pieces or pieces & (board.knights | board.bishops):
+            return 0, 0  # Samotní králové nebo lehká figura, mat nejde dát
+        piece = chess.lsb(pieces)
+        piece_type = board.piece_type_at(piece)
+        if piece_type not in self.tables:
+            return None
+        strong = board.color_at(piece)
+        flip = 0 if strong == chess.WHITE else 56
+        value = self.tables[piece_type][self.index(board.turn == strong, board.king(strong) ^ flip, board.king(not strong) ^ flip, piece ^ flip)]
+        if not value:
+            return 0, 0
+        plies = value - 1
+        return (1 if plies % 2 else -1), plies
+
+
 class AI:
-    def __init__(self, color: bool, difficulty: str) -> None:
+    def __init__(self, color: bool, difficulty: str, tt_size_mb: float = TT_SIZE_MB, workers: int = SEARCH_WORKERS,
+                 book_path: str | None = BOOK_PATH, bitbase_path: str | None = BITBASE_PATH) -> None:
         logger.debug("Initializing AI")
         self.difficulty     = difficulty
         self.color          = color
         self.selected_piece = None  # Přidání atributu selected_piece
-        self.capture_sound = pygame.mixer.Sound(io.BytesIO(base64.b64decode(ASSETS["capture"])))  # Zvuk pro zachycení
-
-    def on_move(self, board: chess.Board, events: tuple[pygame.event.Event, ...]) -> chess.Move:
-        "DO NOT REMOVE EVENTS, Game class will parse events"
-        if self.difficulty == "easy":
-            move = self.easy_move(board)
-        elif self.difficulty == "medium":
-            move = self.medium_move(board)
-        elif self.difficulty == "hard":
-            move = self.hard_move(board)
-        elif self.difficulty == "Fales":
-            move = self.fales_move(board)
-        else:
+        self.workers        = max(1, workers)
+        self.tt             = TranspositionTable(tt_size_mb, shared=self.workers > 1)
+        self.pool           = None  # Pomocné procesy pro Lazy SMP, vytváří se až při prvním hledání
+        self.helpers_stop   = None
+        self.helper_nodes   = 0
+        # Náhodná AI knihovnu nepoužívá, hrála by pak zahájení jako silnější soupeř
+        self.book           = None
+        if book_path and difficulty != "easy":
+            if os.path.isfile(book_path):
+                self.book = chess.polyglot.open_reader(book_path)
+            else:
+                logger.debug(f"Opening book not found: {book_path}")
+        # Přesná hra v koncovkách jen pro Fales
+        self.bitbase        = None
+        if bitbase_path and difficulty == "Fales":
+            if os.path.isfile(bitbase_path):
+                self.bitbase = Bitbase.load(bitbase_path)
+            else:
+                logger.debug(f"Endgame bitbase not found: {bitbase_path}")
+        self.nodes          = 0  # Počet prohledaných pozic během posledního tahu
+        self.qnodes         = 0  # Z toho pozic v klidovém prohledávání
+        self.depth          = 0  # Hloubka poslední dokončené iterace
+        self.time_limit, self.node_limit = MOVE_BUDGETS.get(difficulty, MOVE_BUDGETS["Fales"])
+        self.started        = 0.0
+        self.deadline       = 0.0
+        # Výběrové prohledávání
+        self.null_move            = NULL_MOVE
+        self.late_move_reductions = LATE_MOVE_REDUCTIONS
+        self.futility_pruning     = FUTILITY_PRUNING
+        self.check_extensions     = CHECK_EXTENSIONS
+        # Řazení tichých tahů: dva zabijáci na každé ply a historie podle (strana, odkud, kam)
+        self.killers        = [[0, 0] for _ in range(2 * MAX_DEPTH)]
+        self.history        = [0] * (2 * 64 * 64)
+        # Hodnocení pěšcové struktury podle pawn_key, pěšci se mezi uzly mění málokdy
+        self.pawn_table     = [None] * PAWN_HASH_SIZE
+        self.lazy_evals     = 0  # Hodnocení, kterým stačila levná část
+        self.cutoffs        = 0  # Beta řezy během posledního tahu
+        self.first_cutoffs  = 0  # Z toho hned po prvním tahu
+        self.cutoff_indices = 0  # Součet pořadí tahů, které řez způsobily (1 = první tah)
+        self.iterations     = []  # Průběh iterací posledního hledání
+        self.stats          = {}  # Statistiky posledního hledání, viz search_stats
+        # Prohledávání běží ve vlastním vlákně, aby hlavní smyčka dál vykreslovala
+        self.worker         = None
+        self.worker_fen     = None  # Pozice, pro kterou vlákno tah počítá
+        self.result         = None
+        self.stop_event     = threading.Event()
+        # Přemýšlení v čase soupeře nad předpokládanou odpovědí
+        self.pondering      = False
+        self.pv             = []  # Hlavní varianta posledního hledání
+        self.on_iteration   = None  # Volá se po každé dokončené iteraci s (hloubka, hodnota, hlavní varianta), např. pro UCI
+        # Zvuk pro zachycení, bez mixeru (pomocné procesy, skripty) hraje AI potichu
+        self.capture_sound = pygame.mixer.Sound(io.BytesIO(base64.b64decode(ASSETS["capture"]))) if pygame.mixer.get_init() else None
+
+    def on_move(self, board: chess.Board, events: tuple[pygame.event.Event, ...]) -> chess.Move | None:
+        """DO NOT REMOVE EVENTS, Game class will parse events
+
+        Neblokuje: první volání spustí výpočet na pozadí, tah se zahraje
+        v tom snímku, kdy je výsledek hotový. Do té doby vrací None."""
+        if self.difficulty not in MOVE_BUDGETS:
             raise ValueError("Difficulty not selected")
 
+        if self.worker is None or self.worker_fen != board.fen():
+            self.cancel()  # Pozice se mezitím změnila, starý výsledek (i přemýšlení mimo variantu) nepotřebujeme
+            self.start_thinking(board)
+            return None
+        if self.pondering:
+            # Soupeř zahrál očekávaný tah, hledání pokračuje se zbytkem rozpočtu počítaným od začátku přemýšlení
+            self.deadline = max(time.perf_counter(), self.started + self.time_limit)
+            self.pondering = False
+            logger.debug(f"AI ponder hit after {self.nodes} nodes")
+        if self.worker.is_alive():
+            return None
+
+        move = self.result
+        self.worker = None
+        self.result = None
         if move:
-            if board.is_capture(move):  # Kontrola, zda tah vede k zachycení figury
+            if board.is_capture(move) and self.capture_sound:  # Kontrola, zda tah vede k zachycení figury
                 self.capture_sound.play()  # Přehrání zvuku pro zachycení
             board.push(move)
             self.selected_piece = None  # Reset selected_piece po tahu
             logger.debug("AI moved piece")
         return move
 
+    @property
+    def thinking(self) -> bool:
+        return self.worker is not None and self.worker.is_alive() and not self.pondering
+
+    def ponder(self, board: chess.Board) -> None:
+        """Spustí hledání odpovědi na tah soupeře, který předpovídá hlavní varianta."""
+        if self.difficulty != "Fales" or self.worker is not None or len(self.pv) < 2:
+            return
+        if not board.move_stack or board.peek() != self.pv[0] or not board.is_legal(self.pv[1]):
+            return
+        expected = board.copy()
+        expected.push(self.pv[1])
+        logger.debug(f"AI pondering on {self.pv[1]}")
+        self.pondering = True
+        self.start_thinking(expected)
+
+    def start_thinking(self, board: chess.Board) -> None:
+        self.stop_event.clear()
+        self.worker_fen = board.fen()
+        self.worker = threading.Thread(target=self.think, args=(board.copy(),), daemon=True)
+        self.worker.start()
+
+    def think(self, board: chess.Board) -> None:
+        """Tělo vlákna, pracuje nad kopií šachovnice.
+
+        Chyba výpočtu vlákno neshodí: zaloguje se a zahraje se náhodný legální tah,
+        jinak by on_move hledání spouštěl pořád znovu a hra by stála."""
+        fallback = board.copy(stack=False)  # Knihovna a tabulky koncovek mohou board při chybě nechat rozehraný
+        try:
+            move = None if self.pondering else self.book_move(board) or self.bitbase_move(board)
+            if move:
+                self.pv = []
+            elif self.difficulty == "easy":
+                move = self.easy_move(board)
+            elif self.difficulty == "medium":
+                move = self.medium_move(board)
+            elif self.difficulty == "hard":
+                move = self.hard_move(board)
+            else:
+                move = self.fales_move(board)
+        except Exception:
+            logger.exception(f"AI {self.difficulty} failed in {fallback.fen()}, playing a random move")
+            self.pv = []
+            move = self.easy_move(fallback) if any(fallback.legal_moves) else None
+        if not self.stop_event.is_set():
+            self.result = move
+        post_event(AI_MOVE_EVENT)  # Probudí smyčku, která čeká na vstup
+
+    def cancel(self) -> None:
+        """Zastaví rozběhnuté prohledávání a počká na vlákno."""
+        if self.worker is not None:
+            self.stop_event.set()
+            self.worker.join()
+            logger.debug("AI search cancelled")
+        self.worker    = None
+        self.result    = None
+        self.pondering = False
+
+    def close(self) -> None:
+        """Zastaví výpočet a ukončí pomocné procesy včetně sdílené tabulky."""
+        self.cancel()
+        if self.pool:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+        if self.book:
+            self.book.close()
+            self.book = None
+        self.tt.close()
+
+    def book_move(self, board: chess.Board) -> chess.Move | None:
+        """Tah ze zahajovací knihovny vybraný náhodně podle vah, nebo None mimo knihovnu."""
+        if not self.book:
+            return None
+        try:
+            move = self.book.weighted_choice(board).move
+        except IndexError:
+            return None
+        logger.debug(f"AI played book move {move}")
+        return move
+
+    def bitbase_move(self, board: chess.Board) -> chess.Move | None:
+        """Nejkratší cesta k matu (nebo nejdelší obrana) podle tabulek koncovek, bez prohledávání."""
+        if not self.bitbase:
+            return None
+        result = self.bitbase.probe(board)
+        if result is None or result[0] == 0:
+            return None  # Remízu tabulka neseřadí, tah vybere prohledávání
+        best_move, best_key = None, None
+        for move in board.legal_moves:
+            board.push(move)
+            result = self.bitbase.probe(board)
+            board.pop()
+            if result is None:
+                return None
+            wdl, plies = result  # Z pohledu soupeře po tahu
+            key = (wdl, plies if wdl < 0 else -plies)
+            if best_key is None or key < best_key:
+                best_move, best_key = move, key
+        logger.debug(f"AI played bitbase move {best_move}")
+        return best_move
+
     def easy_move(self, board: chess.Board) -> chess.Move:
-        """AI s náhodnými tahy, počká 1 vteřinu před výběrem."""
-        time.sleep(1)  # Počkejte 1 sekundu
+        """AI s náhodnými tahy."""
         return random.choice(list(board.legal_moves))  # Vybírá náhodný legální tah
 
     def medium_move(self, board: chess.Board) -> chess.Move:
@@ -173,18 +824,33 @@ class AI:
     def hard_move(self, board: chess.Board) -> chess.Move:
         """AI hledá nejlepší tah s důrazem na agresivitu."""
         best_move  = None
-        best_value = -9999
+        best_value = -INFINITY
+        self.start_budget()
 
-        for move in board.legal_moves:
+        # Materiál a PST všech tahů jednou operací nad rovinami potomků místo evaluate_board po každém tahu
+        moves = list(board.legal_moves)
+        mailbox = [0] * 64
+        for square, piece in board.piece_map().items():
+            mailbox[square] = piece.piece_type | piece.color << 3
+        values = evaluate_planes(child_planes(mailbox, board.turn, board.ep_square, [encode_move(move) for move in moves]))
+        self.nodes = len(moves)
+
+        for move, board_value in zip(moves, values.tolist()):
+            if self.color == chess.BLACK:
+                board_value = -board_value
+            # Roviny neznají konec hry: mat, pat a nedostatek materiálu se zjistí po zahrání tahu
             board.push(move)
-            board_value = self.evaluate_board(board)
+            if board.is_insufficient_material():
+                board_value = 0
+            elif not any(board.generate_legal_moves()):
+                board_value = MATE_VALUE if board.is_check() else 0
             board.pop()
 
             # Zvýšená hodnota pro agresivní tahy (zachycení a kontrola centra)
             if board.is_capture(move):
-                board_value += 5
+                board_value += 5 * PAWN_VALUE
             elif move.to_square in [chess.D4, chess.E4, chess.D5, chess.E5]:
-                board_value += 3
+                board_value += 3 * PAWN_VALUE
 
             if board_value > best_value:
                 best_value = board_value
@@ -194,77 +860,432 @@ class AI:
 
     def fales_move(self, board: chess.Board) -> chess.Move:
         """AI s hlubokou analýzou tahů."""
-        best_move, _ = self.minimax(board, depth=3, maximizing_player=True)
+        if self.workers > 1:
+            return self.parallel_search(board)
+        return self.search(board)
+
+    def parallel_search(self, board: chess.Board, max_depth: int = MAX_DEPTH) -> chess.Move:
+        """Lazy SMP: pomocné procesy prohledávají stejnou pozici a plní sdílenou tabulku,
+        hlavní vlákno z ní těží a jeho výsledek se hraje."""
+        if self.pool is None:
+            # spawn i na Linuxu, fork z vícevláknového procesu s pygame není bezpečný
+            context = multiprocessing.get_context("spawn")
+            self.helpers_stop = context.Event()
+            self.pool = context.Pool(self.workers - 1, init_helper, (self.tt.name, self.tt.buckets, self.helpers_stop))
+        self.helpers_stop.clear()
+        # Lichí pomocníci začínají o tah hlouběji, aby se hledání rozcházelo
+        jobs = [self.pool.apply_async(helper_search, (board, self.color, self.time_limit, self.node_limit, max_depth, 1 + index % 2))
+                for index in range(self.workers - 1)]
+        try:
+            best_move = self.search(board, max_depth)
+        finally:
+            self.helpers_stop.set()
+            self.helper_nodes = sum(job.get() for job in jobs)
+        logger.debug(f"AI helpers searched {self.helper_nodes} nodes in {self.workers - 1} processes")
         return best_move
 
-    def minimax(self, board: chess.Board, depth: int, maximizing_player: bool = True) -> tuple[None, int] | tuple[chess.Move, int]:
-        if depth == 0 or board.is_game_over():
-            return None, self.evaluate_board(board)
+    def start_budget(self) -> None:
+        self.nodes         = 0
+        self.qnodes        = 0
+        self.lazy_evals    = 0
+        self.cutoffs       = 0
+        self.first_cutoffs = 0
+        self.cutoff_indices = 0
+        self.iterations    = []
+        self.started       = time.perf_counter()
+        self.deadline      = self.started + self.time_limit
+
+    def visit(self) -> None:
+        """Započítá uzel a občas zkontroluje rozpočet."""
+        self.nodes += 1
+        if self.nodes % BUDGET_CHECK == 0 and self.out_of_budget():
+            raise SearchTimeout
 
-        best_move = None
+    def out_of_budget(self) -> bool:
+        if self.pondering:
+            return self.stop_event.is_set()  # Během přemýšlení v čase soupeře rozpočet neběží
+        return self.nodes >= self.node_limit or time.perf_counter() >= self.deadline or self.stop_event.is_set()
+
+    def search(self, board: chess.Board, max_depth: int = MAX_DEPTH, start_depth: int = 1) -> chess.Move:
+        """Iterativní prohlubování v rámci rozpočtu, vrací nejlepší tah poslední dokončené iterace."""
+        self.start_budget()
+        self.depth = 0
+        self.tt.reset_stats()
+        self.age_move_ordering()
+        # Prohledává se na vlastní šachovnici s přírůstkovým klíčem a hodnocením, board zůstane beze změny
+        position = SearchBoard.from_board(board, SQUARE_SCORES)
+        # Pojistka pro případ, že nedoběhne ani první iterace
+        best_move = next(iter(self.order_moves(position, position.legal_moves())), 0)
+        for depth in range(start_depth, max_depth + 1):
+            try:
+                move, value = self.minimax(position, depth=depth, maximizing_player=True)
+            except SearchTimeout:
+                break  # Rozehranou pozici přerušené iterace zahodíme, board zůstal beze změny
+            if move:
+                best_move = move
+            self.depth = depth
+            self.iterations.append({"depth": depth, "move": decode_move(move).uci() if move else None, "value": value,
+                                    "nodes": self.nodes, "qnodes": self.qnodes, "seconds": time.perf_counter() - self.started})
+            logger.debug(f"AI depth {depth}: {decode_move(move)} ({value}), {self.nodes} nodes")
+            if self.on_iteration:
+                self.on_iteration(depth, value, self.principal_variation(board))
+            if abs(value) >= MATE_VALUE:
+                break  # Mat už hlubší hledání nezmění
+        self.pv = self.principal_variation(board)
+        self.stats = self.search_stats(board, decode_move(best_move))
+        search_logger.debug(format_search_stats(self.stats), extra={"search_stats": self.stats})
+        return decode_move(best_move)
+
+    def search_stats(self, board: chess.Board, move: chess.Move) -> dict:
+        """Záznam o posledním hledání, jen čísla a řetězce, aby šel rovnou uložit do JSON."""
+        seconds = time.perf_counter() - self.started
+        iterations = []
+        previous = {"nodes": 0, "qnodes": 0, "seconds": 0.0}
+        for iteration in self.iterations:
+            # Uzly a čas každé iterace zvlášť, v self.iterations jsou součty od začátku hledání
+            iterations.append({**iteration, **{key: iteration[key] - value for key, value in previous.items()}})
+            previous = {key: iteration[key] for key in previous}
+        return {
+            "fen":               board.fen(),
+            "move":              move.uci() if move else None,
+            "depth":             self.depth,
+            "nodes":             self.nodes,
+            "qnodes":            self.qnodes,
+            "seconds":           seconds,
+            "nps":               self.nodes / seconds if seconds else 0.0,
+            "tt_hit_rate":       self.tt.hit_rate,
+            "cutoffs":           self.cutoffs,
+            "first_cutoff_rate": self.first_cutoff_rate,
+            "mean_cutoff_index": self.cutoff_indices / self.cutoffs if self.cutoffs else 0.0,
+            "lazy_evals":        self.lazy_evals,
+            "pv":                [move.uci() for move in self.pv],
+            "iterations":        iterations,
+        }
+
+    @property
+    def first_cutoff_rate(self) -> float:
+        """Podíl beta řezů, které udělal hned první prohledaný tah (měřítko kvality řazení)."""
+        return self.first_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def age_move_ordering(self) -> None:
+        """Mezi tahy zabijáky zahodí a historii utlumí, v rámci jednoho tahu je sdílí všechny iterace."""
+        for killers in self.killers:
+            killers[0] = killers[1] = 0
+        self.history = [value >> 1 for value in self.history]
+
+    def count_cutoff(self, position: SearchBoard, move: int, depth: int, searched: int, capture: bool) -> None:
+        """Započítá beta řez. Tichý tah, který ho způsobil, se zapamatuje jako zabiják a zvýší se mu historie."""
+        self.cutoffs += 1
+        self.cutoff_indices += searched
+        if searched == 1:
+            self.first_cutoffs += 1
+        if capture:
+            return
+        ply = len(position.stack)
+        if ply < len(self.killers):
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        self.history[position.turn << 12 | move & 0xFFF] += depth * depth
+
+    def principal_variation(self, board: chess.Board) -> list[chess.Move]:
+        """Poskládá hlavní variantu z nejlepších tahů uložených v transpoziční tabulce."""
+        pv = []
+        while len(pv) < MAX_DEPTH:
+            entry = self.tt.probe(chess.polyglot.zobrist_hash(board))
+            move = decode_move(entry[3]) if entry else None
+            if not move or not board.is_legal(move) or board.is_repetition(2):
+                break
+            pv.append(move)
+            board.push(move)
+        for _ in pv:
+            board.pop()
+        return pv
+
+    def minimax(self, position: SearchBoard, depth: int, maximizing_player: bool = True,
+                alpha: int = -INFINITY, beta: int = INFINITY) -> tuple[int, int]:
+        """Minimax s alfa-beta ořezáváním, v listech pokračuje klidovým prohledáváním.
+
+        Tahy jsou zabalené do intu (viz encode_move), 0 znamená žádný tah.
+        Hledání je výběrové: nulový tah, redukce pozdních tahů, futility a prodloužení šachů."""
+        self.visit()
+        # Remízu pravidlem nebo opakováním hlídáme až pod kořenem, v kořeni se hrát musí
+        if position.stack and (position.halfmove >= 100 or position.is_repetition() or position.is_insufficient_material()):
+            return 0, 0
+        in_check = position.in_check()
+        if in_check and self.check_extensions and len(position.stack) < MAX_DEPTH:
+            depth += 1  # Únik ze šachu se dohraje o tah hlouběji
+        if depth == 0:
+            return 0, self.quiescence(position, maximizing_player, alpha, beta)
+
+        # Pozici jsme už mohli potkat jiným pořadím tahů
+        key = position.key
+        entry = self.tt.probe(key)
+        tt_move = 0
+        if entry:
+            tt_depth, flag, tt_value, tt_move = entry
+            if tt_depth >= depth and tt_move:
+                if flag == TT_EXACT:
+                    return tt_move, tt_value
+                elif flag == TT_LOWER:
+                    alpha = max(alpha, tt_value)
+                elif flag == TT_UPPER:
+                    beta = min(beta, tt_value)
+                if alpha >= beta:
+                    return tt_move, tt_value
+        alpha_orig, beta_orig = alpha, beta
+
+        # Nulový tah: když pozice obstojí i po vynechaném tahu, skutečné tahy ji nezhorší.
+        # Ne v šachu, dvakrát po sobě ani bez figur (v koncovce pěšců hrozí nevýhoda tahu)
+        if self.null_move and depth >= NULL_MOVE_MIN_DEPTH and position.stack and not position.last_move_null() \
+                and not in_check and position.has_pieces(position.turn):
+            static_value = self.evaluate(position, alpha, beta)
+            if maximizing_player and static_value >= beta:
+                position.make_null()
+                _, value = self.minimax(position, depth - 1 - NULL_MOVE_REDUCTION, False, beta - 1, beta)
+                position.unmake_null()
+                if value >= beta:
+                    return 0, beta
+            elif not maximizing_player and static_value <= alpha:
+                position.make_null()
+                _, value = self.minimax(position, depth - 1 - NULL_MOVE_REDUCTION, True, alpha, alpha + 1)
+                position.unmake_null()
+                if value <= alpha:
+                    return 0, alpha
+
+        # Futility: těsně nad listy tichý tah pozici o víc než rezervu nezlepší
+        futile = False
+        if self.futility_pruning and depth < len(FUTILITY_MARGINS) and position.stack and not in_check:
+            static_value = self.evaluate(position, alpha, beta)
+            if maximizing_player:
+                futile = static_value + FUTILITY_MARGINS[depth] <= alpha
+            else:
+                futile = static_value - FUTILITY_MARGINS[depth] >= beta
+        reducible = self.late_move_reductions and depth >= LMR_MIN_DEPTH and not in_check
+
+        moves = position.moves()
+        best_move = 0
+        searched = 0
+        pruned = False
         if maximizing_player:
-            best_value = -9999
-            for move in board.legal_moves:
-                board.push(move)
-                _, value = self.minimax(board, depth - 1, False)
-                board.pop()
+            best_value = -INFINITY
+            for move in self.order_moves(position, moves, tt_move, True):
+                capture = move >> 12 or position.is_capture(move)
+                if not position.make(move):
+                    continue  # Pseudolegální tah nechal krále v šachu
+                searched += 1
+                quiet = not capture and not position.in_check()
+                if futile and quiet:
+                    position.unmake()
+                    pruned = True
+                    continue
+                value = self.child_value(position, depth, True, alpha, beta, reducible and quiet and searched > LMR_FULL_MOVES)
+                position.unmake()
 
                 if value > best_value:
                     best_value = value
                     best_move = move
+                alpha = max(alpha, best_value)
+                if alpha >= beta:
+                    self.count_cutoff(position, move, depth, searched, capture)
+                    break  # Soupeř do této větve nepustí
         else:
-            best_value = 9999
-            for move in board.legal_moves:
-                board.push(move)
-                _, value = self.minimax(board, depth - 1, True)
-                board.pop()
+            best_value = INFINITY
+            for move in self.order_moves(position, moves, tt_move, True):
+                capture = move >> 12 or position.is_capture(move)
+                if not position.make(move):
+                    continue
+                searched += 1
+                quiet = not capture and not position.in_check()
+                if futile and quiet:
+                    position.unmake()
+                    pruned = True
+                    continue
+                value = self.child_value(position, depth, False, alpha, beta, reducible and quiet and searched > LMR_FULL_MOVES)
+                position.unmake()
 
                 if value < best_value:
                     best_value = value
                     best_move = move
+                beta = min(beta, best_value)
+                if alpha >= beta:
+                    self.count_cutoff(position, move, depth, searched, capture)
+                    break  # Tuto větev jsme už vyvrátili
+
+        if not best_move:
+            if pruned:
+                return 0, alpha_orig if maximizing_player else beta_orig  # Vše ořezané, pozice je pod oknem
+            return 0, self.terminal_value(position)  # Žádný legální tah: mat nebo pat
+
+        if best_value <= alpha_orig:
+            flag = TT_UPPER
+        elif best_value >= beta_orig:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+        self.tt.store(key, depth, flag, best_value, best_move)
         return best_move, best_value
-        
+
+    def child_value(self, position: SearchBoard, depth: int, maximizing_player: bool, alpha: int, beta: int, reduced: bool) -> int:
+        """Hodnota pozice po tahu strany maximizing_player.
+
+        Redukovaný tah se nejdřív prohledá o tah mělčeji s nulovým oknem, naplno až když okno překoná."""
+        if reduced:
+            if maximizing_player:
+                _, value = self.minimax(position, depth - 2, False, alpha, alpha + 1)
+                if value <= alpha:
+                    return value
+            else:
+                _, value = self.minimax(position, depth - 2, True, beta - 1, beta)
+                if value >= beta:
+                    return value
+        _, value = self.minimax(position, depth - 1, not maximizing_player, alpha, beta)
+        return value
+
+    def quiescence(self, position: SearchBoard, maximizing_player: bool, alpha: int, beta: int) -> int:
+        """Dohraje braní a proměny, aby se list nehodnotil uprostřed výměny.
+
+        Strana na tahu může braní odmítnout (stand pat), prodělečná braní podle SEE se přeskakují.
+        V šachu se odmítnout nedá, prohledají se všechny úniky."""
+        self.visit()
+        self.qnodes += 1
+        in_check = position.in_check()
+        if in_check:
+            best_value = -INFINITY if maximizing_player else INFINITY
+            moves = self.order_moves(position, position.moves())
+        else:
+            best_value = self.evaluate(position, alpha, beta)
+            if maximizing_player:
+                if best_value >= beta:
+                    return best_value
+                alpha = max(alpha, best_value)
+            else:
+                if best_value <= alpha:
+                    return best_value
+                beta = min(beta, best_value)
+            moves = self.tactical_moves(position)
+
+        legal = False
+        for move in moves:
+            if not position.make(move):
+                continue
+            legal = True
+            value = self.quiescence(position, not maximizing_player, alpha, beta)
+            position.unmake()
+
+            if maximizing_player:
+                best_value = max(best_value, value)
+                alpha = max(alpha, value)
+            else:
+                best_value = min(best_value, value)
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+        if in_check and not legal:
+            return self.terminal_value(position)
+        return best_value
+
+    def tactical_moves(self, position: SearchBoard) -> list[int]:
+        """Braní, která podle SEE neprodělají materiál, a proměny, seřazené jako v order_moves."""
+        moves = [move for move in position.moves(tactical=True) if move >> 12 or self.see(position, move) >= 0]
+        return self.order_moves(position, moves)
+
+    def see(self, position: SearchBoard, move: int) -> int:
+        """Statická výměna na cílovém poli: zisk tahu, když obě strany dál berou vždy nejlevnější figurou."""
+        origin, target, promotion = move & 63, move >> 6 & 63, move >> 12
+        occupied = position.occupied & ~(1 << origin)
+        attacker = position.mailbox[origin] & 7
+        if attacker == chess.PAWN and target == position.ep_square:
+            gain = [SEE_VALUES[chess.PAWN]]
+            occupied &= ~(1 << (target - 8 if position.turn == chess.WHITE else target + 8))
+        else:
+            gain = [SEE_VALUES.get(position.mailbox[target] & 7, 0)]
+        on_square = SEE_VALUES[promotion or attacker]
+        side = not position.turn
+
+        while True:
+            # Odebrané figury mizí z occupied, takže se odkrývají i útoky "přes ně" (rentgen)
+            attackers = position.attackers(side, target, occupied)
+            if not attackers:
+                break
+            for piece_type in chess.PIECE_TYPES:
+                candidates = attackers & position.types[piece_type]
+                if candidates:
+                    break
+            gain.append(on_square - gain[-1])
+            on_square = SEE_VALUES[piece_type]
+            occupied &= ~(candidates & -candidates)
+            side = not side
+
+        # Každá strana může výměnu kdykoli ukončit
+        for index in range(len(gain) - 1, 0, -1):
+            gain[index - 1] = -max(-gain[index - 1], gain[index])
+        return gain[0]
+
+    def order_moves(self, position: SearchBoard, moves: list[int], tt_move: int = 0, quiet_heuristics: bool = False) -> list[int]:
+        """Seřadí tahy tak, aby se nejslibnější prohledaly jako první (tah z TT, proměny, šachy, braní podle MVV-LVA).
+
+        S quiet_heuristics jdou po braních zabijáci a ostatní tiché tahy podle historie."""
+        mailbox = position.mailbox
+        ep_square = position.ep_square
+        ply = len(position.stack)
+        killers = self.killers[ply] if quiet_heuristics and ply < len(self.killers) else (0, 0)
+        history = self.history
+        side = position.turn << 12
+
+        def score(move: int) -> int:
+            if move == tt_move:
+                return TT_MOVE_ORDER
+            value = 0
+            promotion = move >> 12
+            if promotion:
+                value += PROMOTION_ORDER + ORDER_VALUES[promotion]
+            target = move >> 6 & 63
+            attacker = mailbox[move & 63] & 7
+            # En passant nemá figuru na cílovém poli, bere se pěšec
+            victim = mailbox[target] & 7 or (chess.PAWN if attacker == chess.PAWN and target == ep_square else 0)
+            if victim:
+                value += CAPTURE_ORDER + ORDER_VALUES[victim] * 10 - ORDER_VALUES[attacker]
+            if position.gives_check(move):
+                value += CHECK_ORDER
+            if not value and move in killers:
+                value = KILLER_ORDER if move == killers[0] else KILLER_ORDER - 1
+            return value
+
+        if quiet_heuristics:
+            return sorted(moves, key=lambda move: (score(move), history[side | move & 0xFFF]), reverse=True)
+        return sorted(moves, key=score, reverse=True)
+
     def evaluate_board(self, board: chess.Board) -> int:
         """Hodnotí pozici na šachovnici."""
         if board.is_checkmate():
-            return 10000 if board.turn == chess.BLACK else -10000
+            return -MATE_VALUE if board.turn == self.color else MATE_VALUE
         if board.is_stalemate() or board.is_insufficient_material():
             return 0
 
-        piece_values = {
-            chess.PAWN: 1,
-            chess.KNIGHT: 3,
-            chess.BISHOP: 3,
-            chess.ROOK: 5,
-            chess.QUEEN: 9,
-            chess.KING: 0
-        }
-
         value = 0
         for piece in board.piece_map().values():
-            piece_value = piece_values[piece.piece_type]
+            piece_value = PIECE_VALUES[piece.piece_type]
             value += piece_value if piece.color == self.color else -piece_value
 
         # Přidání strategického hodnocení
         value += self.position_score(board)
 
+        # Pěšcová struktura, štít krále a aktivita figur
+        white_pawns, black_pawns = board.pieces_mask(chess.PAWN, chess.WHITE), board.pieces_mask(chess.PAWN, chess.BLACK)
+        structure = pawn_structure(white_pawns, black_pawns) + king_shield(white_pawns, black_pawns, board.king(chess.WHITE), board.king(chess.BLACK))
+        structure += piece_activity([0, board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings], board.occupied_co)
+        value += structure if self.color == chess.WHITE else -structure
+
         return value
 
 
     def position_score(self, board: chess.Board) -> int:
         """Vyhodnocení pozice na základě umístění figur."""
         score = 0
-        piece_square_values = {
-            chess.PAWN: [0, 0, 0, 0, 0, 0, 0, 0],
-            chess.KNIGHT: [-5, -4, -3, -3, -3, -3, -4, -5],
-            chess.BISHOP: [-4, -2, -1, -1, -1, -1, -2, -4],
-            chess.ROOK: [-2, -1, 0, 0, 0, 0, -1, -2],
-            chess.QUEEN: [-1, 0, 0, 0, 0, 0, 0, -1],
-            chess.KING: [0, 1, 1, 3, 3, 1, 1, 0],
-        }
-
         for square, piece in board.piece_map().items():
-            piece_value = piece_square_values[piece.piece_type]
+            piece_value = PIECE_SQUARE_VALUES[piece.piece_type]
             if piece.color == self.color:
                 score += piece_value[square // 8]
             else:
@@ -272,6 +1293,190 @@ class AI:
 
         return score
 
+    def evaluate(self, position: SearchBoard, alpha: int = -INFINITY, beta: int = INFINITY) -> int:
+        """Stejné hodnocení jako evaluate_board, materiál a PST ale bere z průběžného součtu šachovnice
+        a pěšcovou strukturu z tabulky.
+
+        Líné hodnocení: je-li levná část o LAZY_MARGIN mimo okno (alpha, beta), aktivita figur se vynechá."""
+        pawns = position.types[chess.PAWN]
+        white_pawns, black_pawns = pawns & position.colors[chess.WHITE], pawns & position.colors[chess.BLACK]
+        structure = self.pawn_score(position.pawn_key, white_pawns, black_pawns)
+        structure += king_shield(white_pawns, black_pawns, position.king(chess.WHITE), position.king(chess.BLACK))
+        value = position.score + structure
+        if self.color == chess.BLACK:
+            value = -value
+        if value + LAZY_MARGIN <= alpha or value - LAZY_MARGIN >= beta:
+            self.lazy_evals += 1
+            return value
+        activity = piece_activity(position.types, position.colors)
+        return value + activity if self.color == chess.WHITE else value - activity
+
+    def pawn_score(self, pawn_key: int, white_pawns: int, black_pawns: int) -> int:
+        """pawn_structure s mezipamětí podle Zobrist klíče pěšců."""
+        index = pawn_key & (PAWN_HASH_SIZE - 1)
+        entry = self.pawn_table[index]
+        if entry and entry[0] == pawn_key:
+            return entry[1]
+        value = pawn_structure(white_pawns, black_pawns)
+        self.pawn_table[index] = (pawn_key, value)
+        return value
+
+    def terminal_value(self, position: SearchBoard) -> int:
+        """Hodnota pozice bez legálního tahu: mat strany na tahu, jinak pat."""
+        if not position.in_check():
+            return 0
+        return -MATE_VALUE if position.turn == self.color else MATE_VALUE
+
+# Pomocník Lazy SMP v samostatném procesu, drží si AI napojenou na sdílenou tabulku
+search_helper = None
+
+def init_helper(tt_name: str, buckets: int, stop) -> None:
+    global search_helper
+    search_helper = AI(chess.WHITE, "Fales", tt_size_mb=0, book_path=None, bitbase_path=None)
+    search_helper.tt = TranspositionTable(buckets * 2 * TranspositionTable.ENTRY.size / (1024 * 1024), name=tt_name)
+    search_helper.stop_event = stop
+
+def helper_search(board: chess.Board, color: bool, time_limit: float, node_limit: int, max_depth: int, start_depth: int) -> int:
+    """Prohledává pozici, dokud hlavní proces nenastaví stop, vrací počet uzlů."""
+    search_helper.color = color
+    search_helper.time_limit, search_helper.node_limit = time_limit, node_limit
+    search_helper.search(board, max_depth, start_depth)
+    return search_helper.nodes
+
+def encode_move(move: chess.Move | None) -> int:
+    """Zabalí tah do 16 bitů (odkud, kam, proměna), 0 znamená žádný tah."""
+    if not move:
+        return 0
+    return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+def decode_move(data: int) -> chess.Move | None:
+    if not data:
+        return None
+    return chess.Move(data & 63, data >> 6 & 63, data >> 12 or None)
+
+def format_search_stats(stats: dict) -> str:
+    """Čitelná podoba záznamu z AI.search_stats pro debug log."""
+    lines = [f"AI searched {stats['nodes']} nodes ({stats['qnodes']} quiescence) to depth {stats['depth']} in {stats['seconds']:.2f}s "
+             f"({stats['nps']:.0f} nps), TT hit rate {stats['tt_hit_rate']:.1%}, first move cutoffs {stats['first_cutoff_rate']:.1%} "
+             f"of {stats['cutoffs']}, mean cutoff index {stats['mean_cutoff_index']:.2f}, {stats['lazy_evals']} lazy evaluations"]
+    for iteration in stats["iterations"]:
+        lines.append(f"  depth {iteration['depth']:>2}: {iteration['move']} ({iteration['value']}), "
+                     f"{iteration['nodes']} nodes ({iteration['qnodes']} quiescence), {iteration['seconds']:.3f}s")
+    return "\n".join(lines)
+
+def pawn_structure(white_pawns: int, black_pawns: int) -> int:
+    """Zdvojení, izolovaní a volní pěšci obou stran, z pohledu bílého."""
+    score = 0
+    for color, own, enemy in ((chess.WHITE, white_pawns, black_pawns), (chess.BLACK, black_pawns, white_pawns)):
+        value = 0
+        for file in range(8):
+            count = chess.popcount(own & chess.BB_FILES[file])
+            if count:
+                value += DOUBLED_PAWN * (count - 1)
+                if not own & ADJACENT_FILES[file]:
+                    value += ISOLATED_PAWN * count
+        for square in chess.scan_forward(own):
+            if not enemy & PASSED_MASKS[color][square]:
+                value += PASSED_PAWN[chess.square_rank(square) if color == chess.WHITE else 7 - chess.square_rank(square)]
+        score += value if color == chess.WHITE else -value
+    return score
+
+def king_shield(white_pawns: int, black_pawns: int, white_king: int, black_king: int) -> int:
+    """Pěšci před zarošádovaným (nebo ještě nevyšlým) králem, z pohledu bílého."""
+    return PAWN_SHIELD * (chess.popcount(SHIELD_MASKS[chess.WHITE][white_king] & white_pawns) -
+                          chess.popcount(SHIELD_MASKS[chess.BLACK][black_king] & black_pawns))
+
+def piece_activity(types: list[int], colors: list[int]) -> int:
+    """Pohyblivost jezdců, střelců, věží a dam a jejich útoky na okolí soupeřova krále, z pohledu bílého.
+
+    Bitboardy jako v SearchBoard (types[typ], colors[barva]), útoky z tabulek python-chess a popcount,
+    bez generování tahů. Pole napadená soupeřovými pěšci se do pohyblivosti nepočítají."""
+    occupied = colors[chess.BLACK] | colors[chess.WHITE]
+    white_pawns = types[chess.PAWN] & colors[chess.WHITE]
+    black_pawns = types[chess.PAWN] & colors[chess.BLACK]
+    pawn_attacks = ((black_pawns & ~chess.BB_FILE_A) >> 9 | (black_pawns & ~chess.BB_FILE_H) >> 7,
+                    ((white_pawns & ~chess.BB_FILE_A) << 7 | (white_pawns & ~chess.BB_FILE_H) << 9) & chess.BB_ALL)
+    score = 0
+    for color in (chess.WHITE, chess.BLACK):
+        own = colors[color]
+        safe = ~own & ~pawn_attacks[not color]
+        king = types[chess.KING] & colors[not color]
+        zone = chess.BB_KING_ATTACKS[king.bit_length() - 1] | king if king else 0
+        value = 0
+        for piece_type, weight in MOBILITY_WEIGHTS.items():
+            for square in chess.scan_forward(types[piece_type] & own):
+                if piece_type == chess.KNIGHT:
+                    attacks = chess.BB_KNIGHT_ATTACKS[square]
+                else:
+                    attacks = 0
+                    if piece_type != chess.ROOK:
+                        attacks |= chess.BB_DIAG_ATTACKS[square][occupied & chess.BB_DIAG_MASKS[square]]
+                    if piece_type != chess.BISHOP:
+                        attacks |= (chess.BB_RANK_ATTACKS[square][occupied & chess.BB_RANK_MASKS[square]] |
+                                    chess.BB_FILE_ATTACKS[square][occupied & chess.BB_FILE_MASKS[square]])
+                value += weight * chess.popcount(attacks & safe) + KING_ATTACK_WEIGHT * chess.popcount(attacks & zone)
+        # Každá strana se zaokrouhluje zvlášť, aby hodnocení zůstalo symetrické
+        value = value * PAWN_VALUE // ACTIVITY_SCALE
+        score += value if color == chess.WHITE else -value
+    return score
+
+def child_planes(mailbox: list[int], turn: bool, ep_square: int | None, moves: list[int]) -> np.ndarray:
+    """Roviny (N, 12, 64) pozic po každém z tahů. Rodič se zkopíruje a přepíšou se jen pole, kterých se tah dotkl."""
+    codes = np.array(mailbox)
+    squares = np.flatnonzero(codes)
+    planes = np.zeros((12, 64), dtype=np.int8)
+    planes[PLANE_INDEX[codes[squares]], squares] = 1
+    children = np.repeat(planes[np.newaxis], len(moves), axis=0)
+
+    # Změny všech potomků posbírané do jednoho zápisu: (potomek, kód figury, pole, 0/1)
+    rows, changed_codes, changed_squares, values = [], [], [], []
+    def change(row: int, code: int, square: int, value: int) -> None:
+        rows.append(row)
+        changed_codes.append(code)
+        changed_squares.append(square)
+        values.append(value)
+
+    for row, move in enumerate(moves):
+        origin, target, promotion = move & 63, move >> 6 & 63, move >> 12
+        code = mailbox[origin]
+        change(row, code, origin, 0)
+        if mailbox[target]:
+            change(row, mailbox[target], target, 0)
+        change(row, promotion | turn << 3 if promotion else code, target, 1)
+        if code & 7 == chess.PAWN and target == ep_square:
+            change(row, chess.PAWN | (not turn) << 3, target - 8 if turn == chess.WHITE else target + 8, 0)
+        elif code & 7 == chess.KING and abs(target - origin) == 2:
+            rook_origin, rook_target = (target + 1, target - 1) if target > origin else (target - 2, target + 1)
+            change(row, mailbox[rook_origin], rook_origin, 0)
+            change(row, mailbox[rook_origin], rook_target, 1)
+    if rows:
+        children[rows, PLANE_INDEX[changed_codes], changed_squares] = values
+    return children
+
+def evaluate_planes(planes: np.ndarray) -> np.ndarray:
+    """Materiál a PST všech pozic najednou, z pohledu bílého."""
+    return planes.reshape(len(planes), -1) @ PLANE_WEIGHTS.ravel()
+
+def post_event(event_type: int) -> None:
+    """Vloží vlastní událost do fronty pygame, bez okna (skripty, UCI, pomocné procesy) nedělá nic."""
+    if pygame.display.get_init():
+        pygame.event.post(pygame.event.Event(event_type))
+
+def next_events(clock: pygame.time.Clock, timeout: int | None = None) -> list[pygame.event.Event]:
+    """Události pro další snímek smyčky.
+
+    S IDLE_WAIT smyčka spí v pygame.event.wait, dokud nepřijde vstup, vlastní událost
+    (AI_MOVE_EVENT, ANIMATION_EVENT) nebo neuplyne timeout, a pak vybere zbytek fronty.
+    Bez něj se jako dřív čte fronta 60x za sekundu."""
+    if not IDLE_WAIT:
+        clock.tick(60)
+        return pygame.event.get()
+    event = pygame.event.wait(IDLE_TIMEOUT if timeout is None else timeout)
+    events = [] if event.type == pygame.NOEVENT else [event]
+    events.extend(pygame.event.get())
+    clock.tick(60)  # Strop snímků i při záplavě událostí, např. pohybu myši
+    return events
+
 def get_color(color: bool) -> str:
     return "white" if color==True else "black"
     
@@ -388,56 +1593,50 @@ def draw_piece(piece: chess.Piece, screen: pygame.Surface, pos: tuple[int, int],
 def draw_square_overlay(screen: pygame.Surface, row: int, col: int) -> None:
     pygame.draw.rect(screen, (128, 255, 128), (col * SQUARE_SIZE+50, row * SQUARE_SIZE+50, SQUARE_SIZE, SQUARE_SIZE), width=15)
 
-def draw_board(board: chess.Board, screen: pygame.Surface, players: tuple[Player, Player], images: Dict[str, pygame.Surface]) -> None:
-    legal_moves = None
-    screen.fill(EGGSHELL)
-    screen.blit(images["chess_board"], (0, 0))
-
-    if board.turn == chess.WHITE:
-        if players[0].selected_piece:
-            row = 7 - chess.square_rank(players[0].selected_square)
-            col = chess.square_file(players[0].selected_square)
-            pygame.draw.rect(screen, (0, 255, 0), (col * SQUARE_SIZE+50, row * SQUARE_SIZE+50, SQUARE_SIZE, SQUARE_SIZE))
-            legal_moves = [move for move in board.legal_moves if move.from_square == players[0].selected_square]
-    else:
-        if players[1].selected_piece:
-            row = 7 - chess.square_rank(players[1].selected_square)
-            col = chess.square_file(players[1].selected_square)
-            pygame.draw.rect(screen, (0, 255, 0), (col * SQUARE_SIZE+50, row * SQUARE_SIZE+50, SQUARE_SIZE, SQUARE_SIZE))
-            legal_moves = [move for move in board.legal_moves if move.from_square == players[1].selected_square]
-
-    if legal_moves:    
-        for move in legal_moves:
-            row = 7 - chess.square_rank(move.to_square)
-            col = chess.square_file(move.to_square)
-            draw_square_overlay(screen, row, col)
+def selection_overlays(board: chess.Board, players: tuple[Player, Player]) -> dict[int, str]:
+    """Překryvy polí pro hráče na tahu: vybraná figura ("selected") a pole, kam může táhnout ("target")."""
+    player = players[0] if board.turn == chess.WHITE else players[1]
+    if not player.selected_piece:
+        return {}
+    overlays = {move.to_square: "target" for move in board.legal_moves if move.from_square == player.selected_square}
+    overlays[player.selected_square] = "selected"
+    return overlays
 
-    x = 0
-    y = 0
-    for char in list(board.board_fen()):
-        if char == "/":
-            x = 0
-            y += 1
-        elif char.isnumeric():
-            x += int(char)
+def draw_square(screen: pygame.Surface, square: int, layer: BoardLayer, overlay: str | None) -> pygame.Rect:
+    """Překreslí jedno pole z vrstvy šachovnice a vrátí jeho obdélník.
+    Figura se kreslí přes překryv znovu, aby zůstala nad ním jako dřív."""
+    row  = 7 - chess.square_rank(square)
+    col  = chess.square_file(square)
+    rect = pygame.Rect(col * SQUARE_SIZE+50, row * SQUARE_SIZE+50, SQUARE_SIZE, SQUARE_SIZE)
+    screen.blit(layer.surface, rect, rect)
+    if overlay:
+        if overlay == "selected":
+            pygame.draw.rect(screen, (0, 255, 0), rect)
         else:
-            piece = chess.Piece.from_symbol(char)
-            draw_piece(piece, screen, (x, y), images)
-            x += 1
-
-def print_game_log(screen: pygame.Surface, moves: Dict[int, chess.Move]) -> None:
-    if moves:
-        if len(moves) > 15:
-            moves = dict(list(moves.items())[-15:])
-        x = FONT_SIZE + 5
-        n = 1
-        for index, move in moves.items():
-            text = f"{index}. {move.uci()}"
-            screen.blit(FONT.render(text, True, FONT_COLOR), (710,x))
-            x += FONT_SIZE + 5
-            n += 1
-    else:
-        screen.blit(FONT.render("No moves", True, FONT_COLOR), (710,FONT_SIZE+5))
+            draw_square_overlay(screen, row, col)
+        if square in layer.pieces:
+            draw_piece(layer.pieces[square], screen, (col, row), layer.images)
+    return rect
+
+def draw_board(board: chess.Board, screen: pygame.Surface, players: tuple[Player, Player], images: Dict[str, pygame.Surface],
+               layer: BoardLayer | None = None) -> None:
+    """Celá šachovnice: vrstva s figurami (předaná se použije znovu) a překryvy výběru nad ní."""
+    layer = layer or BoardLayer(images)
+    layer.update(board)
+    screen.fill(EGGSHELL)
+    screen.blit(layer.surface, (0, 0))
+    for square, overlay in selection_overlays(board, players).items():
+        draw_square(screen, square, layer, overlay)
+
+def print_game_log(screen: pygame.Surface, moves: Dict[int, chess.Move], move_log: MoveLog | None = None) -> None:
+    """Záznam tahů vpravo od šachovnice, předaný MoveLog se použije znovu."""
+    move_log = move_log or MoveLog()
+    move_log.update(moves)
+    screen.blit(move_log.surface, (710, FONT_SIZE + 5))
+
+def render_text(font: pygame.font.Font, text: str, color: tuple[int, int, int], antialias: bool = True) -> pygame.Surface:
+    """font.render přes sdílenou TEXT_CACHE. Vrácený povrch je sdílený, nesmí se do něj kreslit."""
+    return TEXT_CACHE.render(font, text, color, antialias)
 
 pygame.font.init()
 WIDTH, HEIGHT   = 1200, 700 # 600 x 600 herní pole
@@ -454,10 +1653,19 @@ HIGHLIGHT_COLOR = (187, 250, 245)
 FONT_COLOR      = (130, 179, 175)
 BACKGROUND_COLOR= (222, 210, 177)
 EGGSHELL        = (235, 236, 208)
+# Události, po kterých se hra překreslí celá (změna velikosti, okno znovu viditelné)
+REDRAW_EVENTS   = (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWSIZECHANGED, pygame.WINDOWRESTORED)
+# Smyčky čekají na události místo kreslení 60 snímků za sekundu, viz next_events
+IDLE_WAIT       = True
+IDLE_TIMEOUT    = 1000  # ms, pojistka: smyčka se probudí nejpozději po této době
+AI_MOVE_EVENT   = pygame.event.custom_type()  # Vlákno AI dopočítalo tah
+ANIMATION_EVENT = pygame.event.custom_type()  # Časovač animace stavového řádku
 BLACK           = (0, 0, 0)
 FONT_COLOR      = BLACK
 FONT_SIZE       = 30
 FONT            = pygame.font.SysFont('consolas', FONT_SIZE)
+TEXT_CACHE_SIZE = 256  # Vykreslených textů v paměti, viz TextCache
+TEXT_CACHE      = TextCache(TEXT_CACHE_SIZE)
 ERROR_IMAGE     = "iVBORw0KGgoAAAANSUhEUgAAAgAAAAIACAMAAADDpiTIAAAAmVBMVEVEREBHcExEREBETFVESlRES1RESlFESVNESlNDSlNESlRDSVNDSlNDSFJESlNDSlNDSVNDSlNDSlNDSlNDSVJDSlNESlNDSlJES1JDSlNDSlNDSlNDSVNDSlFDSlM9TE5DSlNDSlNDSlJDSlNDSVNFSVFDSlNDSlNDSlNDSlNDSlNDSlNDSlNSUlJDSlJDSlNESlRES1RESlPIbDckAAAAMXRSTlMGAAUenbsjn7zuTHLNDzPJnfiP6P27XlMu2hj7ZhN5CNOIQynhCpfzgbXDpmwBOq4gUhYPsAAAGbRJREFUeNrsnet2sjoURUGoVrwV9Yj3WmvFS23F93+446WtUN2IkJTk24ufayQjJHODQCfUMApmdCsYhorZpugMX9bLxswf7PZbEN52p+0fzNxyb/I4rzh9aeusA/9Nd2hX/X+ddXzWm3sjKetsqM6/+P7p82JNZe6nZ4hfZ0Np/vXFhCVrKiu/9EWvs6Eu/9Fwwpg1kbmlV7HrbKjK/2Pt7sD/Sua+1ESus6Ek/42zAmsymzki115F/k4DrGOzdU3c2qvHv74C61tZryts7VXj37fbYJ3gnrAjaO0Nxfh7ZbBOlr2IWXtDKf7bB7BOnM03ItbeUIl/xwfXO7LSRsDaG+rwr63B9b6sKWDtDWX4Fyfgem82zr72hir8PR9c78+8zGtvKML/vQ2uKbLyNuvaG0rw38zBNV3WyPos31CB//MSXNNmLxnXXgX+bw/gmjobdLPxUIB/bQWuGbLVRnMnsNYA10xZR28nEPyzZr2Czk4g+GfPOho7gQL4Vx/3238P4e2/x38lW03822vQ22jrBIo4/h1Dl3db0mXbzufgxhp4ujqByfm35muqnfNv8z9KMi9+7DGw1NQJTMrfXzsFs0K1c/55/gdRYhl3XhxYWjqBCfm3KkcDskK1cxjwN83NuB2zVhUdncBk/GfD51PzCtXO4cD/YMsM6LVqaOgEJuLvj7/bFypUO4cHf9Mc0ms1qGnnBCbiv9ye+1aodg4T/mahSa+Vo5sTmIR/2Qv3rYifu27ZG/2uZFMzJzAJ/8Y20rdCtXO48DeMKXmubOjlBCbhX3qO9q1Qc3fY8C+YK+pa2dfKCUzAfzD83bdCzd3hw9/0yGcl/bRjGEryd72LvhVq7g4f/qZRpp6VTtOOYajI359e9q1Qte/w4W+an9Sz8mHaMQwF+ZfrV/pWqNp3GPH/WYWL9aukHUMX/ucC+N3XYcTfdKi/CS00cQJT86dr32HE3+xSfxNq6uEEpuf/XQCXfR1G/M0ttX62Fk5gBv5fBXClr8OIv2lR61fSwQnMwv9UANf6Ooz4Hwrg+vqVNHACM/E/FsDVvg4j/vsCINavpL4TmI3/oQB4OoGRxKLWr6S8E5iR/74A+DqBFwVwuX6l1GNowp+5E/i9Fan1e0o9hib8uTuBX1mRWj879Ria8IcTeMyK1PrZaccwNOEPJ/CYFan1s9OOYWjCH07gMStS/oyddgxDE/5wAo+ZRXlRdtoxDE34wwk8ZhblRdlpxzA04Q8n8JhZlBdlpx3D0IQ/nMBjZlFelJ12DEMT/nACC2akAH6tqZ12DEMT/nACzUgB/F5TO+0Yhib84QRGCuBiTW1TQSdQJH84geECuFxTW0EnUCh/OIGhAriyprZ6TqBY/nACzwVwbU2flHMCBfOHE/hTAHo4gaL5wwn8LgA9nEDh/OEEfhWAHk6geP5wAk8FoIcTKIE/nMBwASjuBMrgDyfwuGnhBErhDyfwmOngBMrhDyfQ1MQJlMQfTqAmTqAs/nAC9XACpfGHE6iFEyiPP5xAHZzAWvU2/27KMeAEqu8Evq2kHf9wAjVwAp8fJfKHE6i8E7j5lMkfTqAZKQAFncCmVP5wAiMFoKATWLnJv9XNMgacwFABKOgETgdSj384geECUNAJ3LYk84cTeC4ABZ1Aoyr3/G/CCTwXgIpOYFP28Q8n8KcAVHQCp/L5wwn8KgAVncBaS/b534QT+FUASjqBT/KPfziBkQJQywmc/gV/OIHHTUUn0OjJP/+bcAJPmYpO4Pgvjn84gadMQSewX/4T/nACVXUC539x/ocTaKrqBG7d2P//Vhc2dziBajqBT7H//3Eqbu5wApV0AreDuP//6gmcO5xAJZ3AZtz/f34XOXc4gSo6gaNyDP+10LnDCTRN9ZzASgz/Xk3o3OEERgpAESdwQvN362LnDicwXACKOIEfNP/jfzMWOXc4gaECUMUJnNP8JwXBc19QtT814QTm5AS+tUj+wVT03G2q9utwAvNyAqc0f1v43FdU7b/CCczLCZyT/F1L9NxrA6r2+3AC83ICe4Hw51Jk1qH4uwacwJycwCLJf1AUPffNhDr3TQw4gTk5ge8U/+9ngALnPiS9408DTmBOTuCa4v91CyBw7l2f9A4XBpzAnJzAGcV/thF97TujvdMpJ/5KOYF9in/wInjuHzHvHbg1TvyVcgIdin/QFTr3UdON8c5XrPgr5QSOKf4zgXOveU9+7HtnFVb8lXIC19Sz2dJl3/6wtKzev/V8aozvrN1nxV8pJ3BCsRn+7ltftuPfHUifPfDir5QT6FNsXqPtCvN2IIt/0OHFXyUncESxKUefzY5WgTz+vQIv/io5gXWKTSN6/D9K5L//teHFXyUn0KHYrCPt5jL5z56Z8VfJCewkejbblfj7HwQeN/4qOYHk+/rDcLulTP6P7Pir5AQukryv3x9I5O++suOvkhNIvhMUeh/QHErkH3rxCE5gDk7gnGITeiH4xrvj2bLPDT/+KjmBNsXmNXwJII//+cUjOIG5OIElis021K4hjX+ryJG/Sk5giWJjhdotZfE/f3miACcwHyfwiWJjhdo9SeJf/uDJXyUn0KZ4WaF275LO/12m/FVyAm2KV/idEEsK/6rFlb9KTqBN8bLC7R4l8J8/s+WvkhNoU7yscLsP4fxbnsmXv0pOoE3xsiLtSmL5t+cjzvxVcgJtipcVaffcEMn/oW6y5q+SE0i+r29F2/Wrovi3P+smc/4qOYE2xcv61fdtLYR/b1w02fNXyQm0KV7WRd9pIyN//79xnR3rq5lCTqBN8Spe6dtdLKut8t3brFd9XC86H28cWV/NFHICbep4LTJl8yeZQk6gTZ2vi+DFwgm0qd/wInixcALJ78QXwYuFE1iiruEt8GLhBJaoezgLvORlCjmBJeoe3gIveZkOTqAFXvIy3ZxAMGTuBIIhcycQDJk7gWDI3QkEQ+ZOIBiKzfRzAsFQaKafEwiGQjMNnUAwFJnp6ASCocBMTycQDIVlujqBYAgnEBmcQGSZMziBJpxAOIFwAuEEcs3gBMIJhBMIJxBOINsMTiCcQDiBnDM4gcwzOIHMMziBzDM4gcwzOIHMMziBzDM4gcwzOIHMMziBzDM4gcwzOIHMMziBzDM4gSacQDiBcALhBHLN4ATCCYQTCCcQTiDbDE4gnEA4gZwzOIHMMziBzDM4gcwzOIHMMziBzDM4gcwzOIHMMziBzDM4gcwzOIHMMziBzDM4gcwzOIEmnEA4gXAC4QRyzeAEwgmEEwgnEE4g2wxOIJxAOIGcMziBzDM4gcwzOIHMMziBzDM4gcwzOIHMMziBzDM4gcwzOIHMMziBzDM4gcwzOIHMMziBJpxAOIFwAtk5gTXnfTHufGxu9t3UO+PFuzeSwWHkvS8qnW6CviMn2hJOYLa5Tx/c0wgtexvbt99snRoOVt6zWP6G9zg4zXf2Mort+7xvedqL75ZwAjPNffsYGsNt1si+m7Ef2pdqXST/eiO05v54Q/c9tPzZ32NLOIGZ5v7Rio7RsIi+b5/RffE9cfwdP7rmyxrV99AyvCzLGpzAbPzd32PMrv/GjKoX++KJ4u9drHl1dL3v+wWbVQ1OYJbzf+tyjNn2St9a43Jf3Lqg879/ueaT/rW+w/YlmzWcwAxzf7g2Rs9KxD8IJhsh13+Ta2te7Sc5/g+bJ/BahJsT+HF9jF4/Ef8g6IjYl871NZ+Mkhz/h4YbcfdF3JzAJTHGVwX88F8R7aoi9mVCrHl1lOT432eOuPsiZk7gm0/97eNYAT/X/4/UvgRbiWsehCuAPP732VzcfREzJ3BKjbH/eR+d+a9I/sffgIz7MqTWPFwBMcf/vlrF3RcxcwKHJP99BfS/2j3Tx38QLLLvy4Lkf66AuON/fzeyEcWfmxM4pvnvDjdiR/4PMfz3Z9/M+zKn+X9XQOzxv99qwq6LmTmBlRj+hwo47P8yjn/QzL4vzRj+pwqIP/7327Ow62JmTmAnjv/xMvwG/904+76M4/ifngne4F8Wd1/EzAmsx/LfBY3RDf47L/u+OEH8GNV+/Pk/CFbi7ouYOYGbViz//bF1g787EnAv6saPsZvFH/9BMBZ3X8TNCZzH87+ZLUXsy+f940ay9qsJJzDt3z7cTPx3HyL2pdvOxD9Ym3ACU8+9mYn/WkwtrjPxd4twAtPP/W2VgX9vJKYW3yYZ+B8eRsIJTD93a5aaf/lV1Lmo2ErP/wVOYMZnX7O0/D/E/Ra9ttLyb8IJzPzsY5Y7f7PQbSnBn+d3Arez3Pkbxr4CFODP9DuBxdnd/H3B/I3Ca0sB/ly/E1hs3ct/Kpr/4Togf/5svxP42sqdf7gCcuPP9zuBX5fhefI/V0B+/Bl/J/B4GZ4v/+8KyJE/5+8E1ssJ+bvS+J8qIE/+rL8TWC8n4+/I43/+KcqJP+/vBHbLSfh7MvknfSYoiz/z7wTW3Zv825L5m4Vu+Tb/Ob4TKOUbKZUE9+H2Ri7/W/5f7LvDcAKl898dzr5586feHYYT+Af8g3AF5MX/oKzjO4GC5z5M/By2mT//a+8Owwn8I/4/FZAn/8t3h+EEZuPfvuc5/Ev+/H+/OwwnMFPWad/3d5hF/vyj7w7DCfxT/vsKyJ9/+N1hOIGZMm9wvxO2yJ//+d1hOIF/zn+3G+fP//vdYTiBOfDfV0D+/MU/E2ToBKblvwvG+fMX/kyQnxM4Tc3//JG4zPvSyfB+WuP/9s52O1EeCqNo/ago+oIWRBEEERVFi/d/ca92plNtDSAJH13n4desvXQSfCgQsjlR4ARy7Pv7OH/+N5VCOV2UTf78z+e9yHsRck7gK0f+X5VC+friLHnyP59lgfci1JxAjyv/z4sAZ190vvzju0qhcAKfYjvO2gxLEX1Z8uUf31YKhRP4FPuszsL8fduTlBzeC/zNP7dumicYiBsXEXMC5ZT83cYh5e/Q4u+Ller/pXmCprhxETEn0ErOX7ubJi5qTmCb7n+mvDusRqLyp+YE2qn534hCDz/X4u9LkMH/TXl3WBF2X0zMCbTT8/93BDz+nMbfFy2L/5387rAj7L6YmBOoJ+T/37/BVT/hPGHz98XO5P8nvTvcEzcuIuYEDtn5B9HdiYL1OYO/L3K29z8S3h0OxY2LiDmBkc+c+7jT/7fM94QE1Aljj0W1jO8O23AC8+57kCn/zyPg5+dOIvpyyvj+F+vd4ckKTmDefX9XM+XflNzHfRmK6MtHpdAs7/8x3h3ewwnMv+/uw/m16Od33Ud92Ys5FvdZ3/98+O6w2oETmH/fb9aD+jqvNx991/3ZF1MRcyyul1nf/330TFCHE8iz7wvzx99/8/F33e99GXdEnYs6ftb6n1O/WD+ZoBOofFsTehuxvqurd30ZzcRdi2bhff1ndv3fyyfvzv8WnEDefY8s/6uNMKn+y3T31ZeeLTUEXosU+6Y6xW6aNL9+/0nUCRSw745+2lzb8AM55btHzbz2Rd0dlIbI/C9MOew+zjCmdkw7Z918EnUCRe37YrrKtg670xm+OMW8mx3Nph0n03c/P4k6gUXkQJnRrRMIRr1OIBj1OoFg1OsEglGvEwhGvE4gGO06gWC06wSCNUjXCQS7PQDo1QkEuz0A6NUJBLs9AOjVCQS7PQDo1QkEuz0A6NUJBLs9AOjVCQS7PQAIrh0MdnMAkFw7GOz7AUBt7WCwz42uEwj2weAEEmdwAokzOIHEGZxA4gxOIHEGJ5A4gxNInMEJJM7gBBJncAKJMziBDTiBcALhBMIJpMrgBMIJhBMIJxBOIFkGJxBOIJxAygxOIHEGJ5A4gxNInMEJJM7gBBJncAKJMziBxBmcQOIMTiBxBieQOIMTSJzBCSTO4AQ24ATCCYQTCCeQnynvneFw6HmyfDweO51F9CuOCTiBfGzd8XS7dQqX4/mPc2nPHO26W8vrSHACs7Bf5gSuh5b25s9Zcyl3bBwGh6NSy+MYTmAOtj7aJ5M1ZmEzf7eVlbodx3ACnx0368Fgnpo1k02WLb0DJ/CXOoFrzx1kz5rN/Ja+gBP4g9XcCXzvv6rPZ81i89Be1eKeAE5gJtbph7mzZrI/q0ZXvG9wAjP8Rtslb9YsZrqrio9tOIFp97TGbn4uKv/rNjgs4AQ27g6AGjmB06AnMGsG23Q9B05gDZ3ASG6LzprFzP66ontbOIEsplhmXFb+l62nVfO8C04gY45E28Rl5n/5l7qfVjAmgBP4iM1cNS47/+vWHpZ+vwsn8Cf7E38F+f89BOAEVuoELjQ1riz/y3Yawgms0AlsWuO40vzP58n+BU5gVU6gbMZV53/ZNu66tOsdnMAbNgzjOuR/Yb4elXS/CyfwH3O287rkf9nCVUnjXTiBf5nsxzXKP47nrlPGmBBO4B8268b1yv86VeiV8EwATuAHM3r1y/96HVbgBJbhBCpBXMv847PvwQks3gk8+vx5bfzB6ynQXNe+bFvXDbq7kdnjPyYm30aEcAKF5y+5c4785+ZJO8hThXE/1PEsdz9Qec4Jg2LdQfJO4Msobzab0NWHTpY2mitju+vlPcZUq8h7IOpOoDfOd23eH45Pnpujld4y810TWk5x50DaTqB0mD+fv9q2j07OdmdGN49jNugU9jdA2glcnJ6+No9bssTX7vqo+U/fE/Tkon4Dyk5gZ/lkDuPAi0T0JRq65rPnHRtOoOh9P46fyn/SNpoCz8PDYPPcfcdegRModN8N9Zn8TXsm+j5MscKn7gnDGZxAgfvenzyRf2hEhdyHDwP1GXd8VcAzIaJOoBM8MQ5vTYsbh7+44+xjgvFQ/DMhmk7gups5fzUoeC5KsbLfi2w84X0h6QSuT1nzv4+/oLkIyfIzvzsgi+4LRSdQ2WXMf9ItqT6V0+9lHIuohuC+EHQCF28Z838dNsrJ/zokyPouwlwX2xd6TuA649+/aTTKy/86LXfKNiacyELbpecEapnyV7frcvO/bJ6ZaUy4WcEJ5Hn+lyn/cFrF+/prW80yJhxJcALz7/tbhvx7llNRvYZpmOX4NOAE5t73VYbf97XC+vRRX00/P73CCcy973Zq/vOtU2kNv9UgvcbcQly71JzAXVr+y2HVNTz/SYrsMYEsrl1qTuAyJf/9ogY1XP94agljQktcu9ScwHFi/uqhJjXcw+RnAltx7VJzAv3EGr7HutRwbrqJz4T64tql5gSOksbXLzVa10FXE54J6eLapeYEthJqsyi1WtfD67GfCU3FtUvNCTSY+WtSzdZ1WTGdVV9gu9ScwDXjfb25Vb91fRYhIxtXYLvknED7YRuqUcd1naTTw2w2Iv1Uck7g2n+Uv1zPdb2a+0fZ2CLboOcETjc/2th4dV3XLXpwXdxFItsg6AQa3+dcx8f6rusXad+zGSlC26DoBA7v381bvtd6rVddvftd9muxbZCsE/hZDfbjtUvbqflav6vT1++yFO2EUq0TODu0r+PB8UlXfsFaz8PtYHMZqfotORLeBuE6gc5Mql/WTKbMiqkdijqBxBnqBBJnqBNInKFOIHGGOoHEGdYOJs6wdjBxhrWDiTOsHUycYe1g4gxrBxNnWDuYOMPawcQZ1g4mzrB2MHGGtYOJM6wdTJxh7WDiDGsHE2dYO5g4gxMIJxBOIGUGJxBOIJxAygxOIHEGJ5A4gxNInMEJJM7gBBJncAKJMziBxBmcQOIMTiBxBieQOIMTSJzBCSTO4AQ24ATCCYQTCCeQKoMTCCcQTiCcQDiBZBmcQDiBcAIpMziBxBmcQOIMTiBxBieQOIMTSJzBCSTO4AQSZ3ACiTM4gcQZnEDiDE4gcQYnkDiDE9iAEwgnEE4gnECqDE4gnEA4gXAC4QSSZXAC4QTCCaTM4AQSZ3ACiTM4gcTZb3AC35FXcaxGTqDGmpeaIq/i2JA19tLytpHbCdyy5qVk5FUck1ljr23eNnI7gX3WvFQfeRXH+qyxVz9vG7mdQIs1L3VCXsWxE2vsZeVtI7cT6LHmpTYK8iqKST3W2MvL24YkfF7qrCOvopjByj+e5W0jtxMYbVjzEgMHeRXEQlb+m9xt5HYCGyPWvMTZQF7FMI+VfzzK3Ub+fmms/M++gryKYNKSlf/HY4CSncCGwcr/HO+RVxEsYOZ/ffhSthPYXExY+cexjbzEM4ud/1xplO4EStKImT/HcwkwFtPnzPzjMH8bUv5+9dn5Xy5KEjIUySKb/fcfx4f8bUj5+zWbs/O/3JdOkaE41mkn5T+f5W9D4ujXLiH/S69aHWQohs00NSn/846jDYmjX0ZS/hc2eT2sJGTIyTrWbp78O58NnjZ4rktmcr+u22YZtr+2t9fr9tZug2Vj4XITxyl/Z2fT4TnGeI5VPTV/sBKYznWO4TlXNX3kUD0z1zz5S1zXKh05VM90rnsMieteJXpFDlWzkO8+m/N5zWqOHKpl6pTTMeEcq7jIoVrmco47Jc6x6nqEHKpkI4nzuYPE+6yi00MO1bHeO+9zJ4n7WZWBHCpjE5n7uaPE/6zygGyqYn3+586SgOfXLrKphrkC5h2EzFV3kU0VrBsJmHcSMn8VacimfBaIyL8haP7SRjZls62YeWdR8/W6imzKZKouyDuQBP0/jdUS2ZTHzKmo3CRB/0+jsdgjm7LYfi3MO5JE5X9hho9symCmLNA7k8TlLzWdrYq8imbqVhHqHQr2V90N8iqSqS3R6zGIdlpnbg95FcV67otw71i80xx5XYwJC2DqzliL984l4flfN8UITGQoki0DQynkvQOpiPw/2It8CNoDs6ciw/xM7ZmDdnDwZoW9d/I/R9rMeOuD0XEAAAAASUVORK5CYII="
 
 # Base64 representation of used images (file loading not worky in exe version)
@@ -89,7 +89,7 @@ def main(debug=False):
                 logger.info("Exiting")
                 run = False
 
-        game.loop(events, multiplayer="server")
+        rects = game.loop(events, multiplayer="server")
 
         if not game.game_end:
             if game.board.turn == chess.WHITE:
@@ -111,7 +111,7 @@ def main(debug=False):
                 except ValueError:
                     pass
 
-        pygame.display.update()  # Update the display
+        pygame.display.update(rects)  # Jen změněné části obrazovky
         clock.tick(60)
 
     # Close the connection when the game is over
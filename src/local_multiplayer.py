@@ -12,14 +12,12 @@ def main(debug=False):
     logger.debug("Entering game loop")
     run = True
     while run:
-        events = pygame.event.get()
+        events = next_events(clock, 0 if game.renderer.redraw_all else None)  # Spí, dokud nepřijde vstup
         for event in events:
             if event.type == pygame.QUIT:
                 logger.info("Exiting")
                 run = False
-        game.loop(events)
-        pygame.display.update()  # Update the display
-        clock.tick(60)
+        pygame.display.update(game.loop(events))  # Jen změněné části obrazovky
 
 
 if __name__ == "__main__":
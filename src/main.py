@@ -1,98 +1,31 @@
 import pygame
 import logging as log
+import multiprocessing
 from os import chdir
 from os.path import abspath, dirname
 from common import *
 
-class MainMenu:
+class MainMenu(Menu):
+    title  = "CZESS"
+    help_y = 1.1  # Posun nápovědy dolů, aby se nezasahovalo do položky "Exit"
+
     def __init__(self):
-        self.options = ["Singleplayer", "Local Multiplayer", "LAN Multiplayer", "Exit"]
-        self.help_texts = [
+        super().__init__(["Singleplayer", "Local Multiplayer", "LAN Multiplayer", "Exit"], [
             "Play against the AI.",
             "Play with a friend on the same device.",
             "Play with a friend over the network.",
             "Exit the game."
-        ]
-        self.selected_option = 0
-        self.font_title = pygame.font.Font(None, 64)
-        self.font_option = pygame.font.Font(None, 50)
-        self.font_help = pygame.font.Font(None, 30)
-        self.shadow_color = (128, 119, 97)
-        self.highlight_color = (187, 250, 245)
-        self.font_color = (130, 179, 175)
+        ])
         self.exit_color = (255, 0, 0)  # Červená barva pro Exit
-        self.background_color = (222, 210, 177)
-
-    def draw(self, screen: pygame.Surface, width: int, height: int):
-        screen.fill(self.background_color)
-
-        title_surface = self.font_title.render("CZESS", True, self.font_color)
-        title_shadow = self.font_title.render("CZESS", True, self.shadow_color)
-        title_rect = title_surface.get_rect(center=(width // 2, height // 4))
-        screen.blit(title_shadow, title_rect.move(3, 3))
-        screen.blit(title_surface, title_rect)
-
-        # Posun nápovědy dolů, aby se nezasahovalo do položky "Exit"
-        help_surface = self.font_help.render(self.help_texts[self.selected_option], True, self.font_color)
-        help_rect = help_surface.get_rect(center=(width // 2, height // 1.1))
-        screen.blit(help_surface, help_rect)
-
-        # Dynamicky upravujeme pozice a velikosti textu na základě velikosti okna
-        option_height = height // (len(self.options) + 1)
-        spacing = option_height * 0.5  # Vzdálenost mezi položkami na základě výšky okna
-
-        for index, option in enumerate(self.options):
-            if index == self.selected_option:
-                color = self.exit_color if option == "Exit" else self.highlight_color
-            else:
-                color = self.font_color
-            
-            option_surface = self.font_option.render(option, True, color)
-            option_shadow = self.font_option.render(option, True, self.shadow_color)
-            option_rect = option_surface.get_rect(center=(width // 2, height // 2 + index * spacing))
 
-            # Upravujeme pozici pro Exit
-            if option == "Exit":
-                option_rect.y += 20  # Posunout Exit o 20 pixelů níže
+    def option_center(self, index: int, width: int, height: int) -> tuple[float, float]:
+        x, y = super().option_center(index, width, height)
+        return x, y + 20 if self.options[index] == "Exit" else y  # Posunout Exit o 20 pixelů níže
 
-            screen.blit(option_shadow, option_rect.move(3, 3))
-            screen.blit(option_surface, option_rect)
-
-    def move_selection(self, direction):
-        self.selected_option = (self.selected_option + direction) % len(self.options)
-
-    def handle_input(self, events, width, height):
-        # Dynamicky upravujeme pozici a velikosti textu na základě velikosti okna
-        option_height = height // (len(self.options) + 1)
-        spacing = option_height * 0.5  # Vzdálenost mezi položkami na základě výšky okna
-
-        for event in events:
-            if event.type == pygame.QUIT:
-                log.info("Exiting")
-                return "exit"  # Návrat pro ukončení
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP:
-                    self.move_selection(-1)
-                elif event.key == pygame.K_DOWN:
-                    self.move_selection(1)
-                elif event.key == pygame.K_RETURN:
-                    return self.selected_option
-            if event.type == pygame.MOUSEMOTION:
-                mouse_x, mouse_y = event.pos
-                for index in range(len(self.options)):
-                    option_rect = self.font_option.render(self.options[index], True, self.font_color).get_rect(center=(width // 2, height // 2 + index * spacing))
-                    if option_rect.collidepoint(mouse_x, mouse_y):
-                        self.selected_option = index
-                        break  # Ujistíme se, že se zvýraznění změní jen na jednu položku
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:
-                    mouse_x, mouse_y = event.pos
-                    for index in range(len(self.options)):
-                        option_rect = self.font_option.render(self.options[index], True, self.font_color).get_rect(center=(width // 2, height // 2 + index * spacing))
-                        if option_rect.collidepoint(mouse_x, mouse_y):
-                            self.selected_option = index
-                            return self.selected_option
-        return None
+    def option_color(self, index: int) -> tuple[int, int, int]:
+        if index == self.selected_option and self.options[index] == "Exit":
+            return self.exit_color
+        return super().option_color(index)
 
 def main(debug=False):
     global logger
@@ -112,11 +45,12 @@ def main(debug=False):
     pygame.display.set_caption('Czess - Mainmenu')
 
     menu = MainMenu()
+    clock = pygame.time.Clock()
 
     logger.debug("Entering main loop")
     run = True
     while run:
-        events = pygame.event.get()
+        events = next_events(clock, 0 if menu.drawn is None else None)  # Spí, dokud nepřijde vstup
         for event in events:
             if event.type == pygame.QUIT:
                 logger.info("Exiting")
@@ -130,6 +64,9 @@ def main(debug=False):
             width = max(width, 800)
             height = max(height, 600)
             screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
+            menu.invalidate()
+        if any(event.type in REDRAW_EVENTS for event in events):
+            menu.invalidate()
 
         menu_result = menu.handle_input(events, width, height)  # Předat šířku a výšku do handle_input
         if menu_result is not None:
@@ -153,13 +90,13 @@ def main(debug=False):
                 run = False  # Ukončí smyčku pro návrat do hlavního menu
 
         if run:  # Zkontroluj, zda stále pokračujeme
-            menu.draw(screen, width, height)  # Předat velikost obrazovky do metody draw
-            pygame.display.update()
+            pygame.display.update(menu.draw(screen, width, height))  # Kreslí se jen po změně výběru nebo okna
 
     pygame.quit()  # Ukončení Pygame po návratu do hlavního menu
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Pomocné procesy AI v zabaleném exe
     try:
         main()
         logger.info("Program exited")
@@ -0,0 +1,404 @@
+import chess
+import chess.polyglot
+
+# Šachovnice jen pro prohledávání AI: bitboardy v obyčejných intech, tahy zabalené do intu
+# (odkud | kam << 6 | proměna << 12, stejně jako encode_move v common) a tahy bez kopírování pozice.
+# Generátor je pseudolegální, legalitu ověřuje až make(), který nelegální tah sám vrátí zpět.
+
+WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE = 1, 2, 4, 8
+# Která práva na rošádu zůstanou, když se z pole nebo na pole táhne
+CASTLING_MASKS = [15] * 64
+CASTLING_MASKS[chess.E1] = 15 & ~(WHITE_KINGSIDE | WHITE_QUEENSIDE)
+CASTLING_MASKS[chess.H1] = 15 & ~WHITE_KINGSIDE
+CASTLING_MASKS[chess.A1] = 15 & ~WHITE_QUEENSIDE
+CASTLING_MASKS[chess.E8] = 15 & ~(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+CASTLING_MASKS[chess.H8] = 15 & ~BLACK_KINGSIDE
+CASTLING_MASKS[chess.A8] = 15 & ~BLACK_QUEENSIDE
+
+# Zobrist klíče kompatibilní s chess.polyglot.zobrist_hash, aby se daly sdílet s transpoziční tabulkou
+RANDOM        = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+PIECE_KEYS    = [[0] * 64 for _ in range(16)]
+for piece_type in chess.PIECE_TYPES:
+    for color in chess.COLORS:
+        PIECE_KEYS[piece_type | color << 3] = [RANDOM[64 * ((piece_type - 1) * 2 + color) + square] for square in chess.SQUARES]
+CASTLING_KEYS = [0] * 16
+for rights in range(16):
+    for index in range(4):
+        if rights & 1 << index:
+            CASTLING_KEYS[rights] ^= RANDOM[768 + index]
+EP_KEYS       = RANDOM[772:780]
+TURN_KEY      = RANDOM[780]
+
+KNIGHT_ATTACKS = chess.BB_KNIGHT_ATTACKS
+KING_ATTACKS   = chess.BB_KING_ATTACKS
+PAWN_ATTACKS   = chess.BB_PAWN_ATTACKS
+RANK_ATTACKS, RANK_MASKS = chess.BB_RANK_ATTACKS, chess.BB_RANK_MASKS
+FILE_ATTACKS, FILE_MASKS = chess.BB_FILE_ATTACKS, chess.BB_FILE_MASKS
+DIAG_ATTACKS, DIAG_MASKS = chess.BB_DIAG_ATTACKS, chess.BB_DIAG_MASKS
+PROMOTION_RANKS = chess.BB_RANK_1 | chess.BB_RANK_8
+PROMOTIONS      = (chess.QUEEN, chess.KNIGHT, chess.ROOK, chess.BISHOP)
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    return DIAG_ATTACKS[square][occupied & DIAG_MASKS[square]]
+
+def rook_attacks(square: int, occupied: int) -> int:
+    return RANK_ATTACKS[square][occupied & RANK_MASKS[square]] | FILE_ATTACKS[square][occupied & FILE_MASKS[square]]
+
+
+class SearchBoard:
+    """Pozice pro prohledávání s přírůstkovým Zobrist klíčem a hodnocením materiálu a PST.
+
+    score je z pohledu bílého a počítá se z tabulky square_scores[typ figury][pole].
+    pawn_key je Zobrist klíč jen z pěšců, mění se málokdy a klíčuje se jím hodnocení pěšcové struktury."""
+    __slots__ = ("types", "colors", "mailbox", "turn", "castling", "ep_square", "ep_key", "halfmove",
+                 "key", "pawn_key", "score", "square_scores", "stack", "history")
+
+    def __init__(self, square_scores: dict[int, list[int]]) -> None:
+        self.types         = [0] * 7  # Bitboard pro každý typ figury, index 0 nepoužitý
+        self.colors        = [0, 0]   # Bitboard černých a bílých figur
+        self.mailbox       = [0] * 64 # Kód figury na poli: typ | barva << 3, 0 = prázdné
+        self.turn          = chess.WHITE
+        self.castling      = 0
+        self.ep_square     = None
+        self.ep_key        = 0
+        self.halfmove      = 0
+        self.key           = 0
+        self.pawn_key      = 0
+        self.score         = 0
+        self.square_scores = square_scores
+        self.stack         = []  # Co je potřeba k vrácení tahu
+        self.history       = []  # Klíče předchozích pozic kvůli opakování
+
+    @classmethod
+    def from_board(cls, board: chess.Board, square_scores: dict[int, list[int]]) -> "SearchBoard":
+        position = cls(square_scores)
+        for square, piece in board.piece_map().items():
+            position.put(square, piece.piece_type | piece.color << 3)
+            value = square_scores[piece.piece_type][square]
+            position.score += value if piece.color == chess.WHITE else -value
+            if piece.piece_type == chess.PAWN:
+                position.pawn_key ^= PIECE_KEYS[chess.PAWN | piece.color << 3][square]
+        position.turn = board.turn
+        for color, kingside, queenside in ((chess.WHITE, WHITE_KINGSIDE, WHITE_QUEENSIDE), (chess.BLACK, BLACK_KINGSIDE, BLACK_QUEENSIDE)):
+            if board.has_kingside_castling_rights(color):
+                position.castling |= kingside
+            if board.has_queenside_castling_rights(color):
+                position.castling |= queenside
+        position.ep_square = board.ep_square
+        position.ep_key    = position.ep_hash()
+        position.halfmove  = board.halfmove_clock
+        position.key       = chess.polyglot.zobrist_hash(board)
+
+        # Opakovat se mohou jen pozice od posledního nevratného tahu
+        previous = board.copy()
+        while previous.move_stack and len(position.history) < board.halfmove_clock:
+            previous.pop()
+            position.history.append(chess.polyglot.zobrist_hash(previous))
+        position.history.reverse()
+        return position
+
+    def put(self, square: int, code: int) -> None:
+        bit = 1 << square
+        self.types[code & 7] |= bit
+        self.colors[code >> 3] |= bit
+        self.mailbox[square] = code
+
+    def remove(self, square: int, code: int) -> None:
+        bit = ~(1 << square)
+        self.types[code & 7] &= bit
+        self.colors[code >> 3] &= bit
+        self.mailbox[square] = 0
+
+    @property
+    def occupied(self) -> int:
+        return self.colors[0] | self.colors[1]
+
+    def king(self, color: bool) -> int:
+        return (self.types[chess.KING] & self.colors[color]).bit_length() - 1
+
+    def ep_hash(self) -> int:
+        """Stejně jako Polyglot započítá en passant jen tehdy, když ho některý pěšec může sebrat."""
+        if self.ep_square is None:
+            return 0
+        if PAWN_ATTACKS[not self.turn][self.ep_square] & self.types[chess.PAWN] & self.colors[self.turn]:
+            return EP_KEYS[self.ep_square & 7]
+        return 0
+
+    def attackers(self, color: bool, square: int, occupied: int) -> int:
+        types = self.types
+        queens = types[chess.QUEEN]
+        return ((KNIGHT_ATTACKS[square] & types[chess.KNIGHT]) |
+                (KING_ATTACKS[square] & types[chess.KING]) |
+                (PAWN_ATTACKS[not color][square] & types[chess.PAWN]) |
+                (rook_attacks(square, occupied) & (types[chess.ROOK] | queens)) |
+                (bishop_attacks(square, occupied) & (types[chess.BISHOP] | queens))) & self.colors[color] & occupied
+
+    def is_attacked(self, color: bool, square: int) -> bool:
+        types = self.types
+        them = self.colors[color]
+        if KNIGHT_ATTACKS[square] & types[chess.KNIGHT] & them or KING_ATTACKS[square] & types[chess.KING] & them:
+            return True
+        if PAWN_ATTACKS[not color][square] & types[chess.PAWN] & them:
+            return True
+        queens = types[chess.QUEEN] & them
+        occupied = self.colors[0] | self.colors[1]
+        return bool(rook_attacks(square, occupied) & (types[chess.ROOK] & them | queens) or
+                    bishop_attacks(square, occupied) & (types[chess.BISHOP] & them | queens))
+
+    def in_check(self) -> bool:
+        return self.is_attacked(not self.turn, self.king(self.turn))
+
+    def is_capture(self, move: int) -> bool:
+        target = move >> 6 & 63
+        if self.mailbox[target]:
+            return True
+        return target == self.ep_square and self.mailbox[move & 63] & 7 == chess.PAWN
+
+    def has_pieces(self, color: bool) -> bool:
+        """Má strana i jiné figury než krále a pěšce?"""
+        return bool(self.colors[color] & ~(self.types[chess.PAWN] | self.types[chess.KING]))
+
+    def last_move_null(self) -> bool:
+        return bool(self.stack) and not self.stack[-1][0]
+
+    def gives_check(self, move: int) -> bool:
+        """Dává tah přímý šach? Odkrytý šach se nepočítá, pro řazení tahů to stačí."""
+        origin = move & 63
+        target = move >> 6 & 63
+        piece_type = move >> 12 or self.mailbox[origin] & 7
+        king = 1 << self.king(not self.turn)
+        if piece_type == chess.PAWN:
+            return bool(PAWN_ATTACKS[self.turn][target] & king)
+        if piece_type == chess.KNIGHT:
+            return bool(KNIGHT_ATTACKS[target] & king)
+        if piece_type == chess.KING:
+            return False
+        occupied = (self.colors[0] | self.colors[1]) & ~(1 << origin) | 1 << target
+        attacks = 0
+        if piece_type != chess.ROOK:
+            attacks |= bishop_attacks(target, occupied)
+        if piece_type != chess.BISHOP:
+            attacks |= rook_attacks(target, occupied)
+        return bool(attacks & king)
+
+    def moves(self, tactical: bool = False) -> list[int]:
+        """Pseudolegální tahy strany na tahu, s tactical=True jen braní a proměny."""
+        moves = []
+        append = moves.append
+        turn = self.turn
+        types = self.types
+        own = self.colors[turn]
+        enemy = self.colors[not turn]
+        occupied = own | enemy
+        targets = enemy if tactical else ~own & chess.BB_ALL
+
+        for piece_type in (chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN, chess.KING):
+            pieces = types[piece_type] & own
+            while pieces:
+                origin = (pieces & -pieces).bit_length() - 1
+                pieces &= pieces - 1
+                if piece_type == chess.KNIGHT:
+                    attacks = KNIGHT_ATTACKS[origin]
+                elif piece_type == chess.BISHOP:
+                    attacks = bishop_attacks(origin, occupied)
+                elif piece_type == chess.ROOK:
+                    attacks = rook_attacks(origin, occupied)
+                elif piece_type == chess.QUEEN:
+                    attacks = rook_attacks(origin, occupied) | bishop_attacks(origin, occupied)
+                else:
+                    attacks = KING_ATTACKS[origin]
+                attacks &= targets
+                while attacks:
+                    target = (attacks & -attacks).bit_length() - 1
+                    attacks &= attacks - 1
+                    append(origin | target << 6)
+
+        pawns = types[chess.PAWN] & own
+        ep_mask = 1 << self.ep_square if self.ep_square is not None else 0
+        forward = 8 if turn == chess.WHITE else -8
+        double_rank = chess.BB_RANK_2 if turn == chess.WHITE else chess.BB_RANK_7
+        while pawns:
+            origin = (pawns & -pawns).bit_length() - 1
+            pawns &= pawns - 1
+            bit = 1 << origin
+            pushes = 0
+            target = origin + forward
+            if not occupied & 1 << target:
+                pushes = 1 << target
+                if bit & double_rank and not occupied & 1 << (target + forward):
+                    pushes |= 1 << (target + forward)
+            if tactical:
+                pushes &= PROMOTION_RANKS
+            attacks = PAWN_ATTACKS[turn][origin] & (enemy | ep_mask) | pushes
+            while attacks:
+                target = (attacks & -attacks).bit_length() - 1
+                attacks &= attacks - 1
+                if 1 << target & PROMOTION_RANKS:
+                    for promotion in PROMOTIONS:
+                        append(origin | target << 6 | promotion << 12)
+                else:
+                    append(origin | target << 6)
+
+        if not tactical and self.castling:
+            # Cílové pole krále hlídá až make(), tady stačí výchozí a přecházené pole
+            if turn == chess.WHITE:
+                if self.castling & WHITE_KINGSIDE and not occupied & (chess.BB_F1 | chess.BB_G1) \
+                        and not self.is_attacked(chess.BLACK, chess.E1) and not self.is_attacked(chess.BLACK, chess.F1):
+                    append(chess.E1 | chess.G1 << 6)
+                if self.castling & WHITE_QUEENSIDE and not occupied & (chess.BB_B1 | chess.BB_C1 | chess.BB_D1) \
+                        and not self.is_attacked(chess.BLACK, chess.E1) and not self.is_attacked(chess.BLACK, chess.D1):
+                    append(chess.E1 | chess.C1 << 6)
+            else:
+                if self.castling & BLACK_KINGSIDE and not occupied & (chess.BB_F8 | chess.BB_G8) \
+                        and not self.is_attacked(chess.WHITE, chess.E8) and not self.is_attacked(chess.WHITE, chess.F8):
+                    append(chess.E8 | chess.G8 << 6)
+                if self.castling & BLACK_QUEENSIDE and not occupied & (chess.BB_B8 | chess.BB_C8 | chess.BB_D8) \
+                        and not self.is_attacked(chess.WHITE, chess.E8) and not self.is_attacked(chess.WHITE, chess.D8):
+                    append(chess.E8 | chess.C8 << 6)
+        return moves
+
+    def make(self, move: int) -> bool:
+        """Zahraje tah. Pokud by vlastní král zůstal v šachu, tah vrátí a vrátí False."""
+        origin = move & 63
+        target = move >> 6 & 63
+        promotion = move >> 12
+        mailbox = self.mailbox
+        code = mailbox[origin]
+        piece_type = code & 7
+        captured = mailbox[target]
+        turn = self.turn
+        scores = self.square_scores
+        sign = 1 if turn == chess.WHITE else -1
+
+        self.stack.append((move, captured, self.castling, self.ep_square, self.ep_key, self.halfmove, self.key, self.pawn_key, self.score))
+        self.history.append(self.key)
+        key = self.key ^ CASTLING_KEYS[self.castling] ^ self.ep_key ^ TURN_KEY
+        score = self.score
+        halfmove = self.halfmove + 1
+
+        self.remove(origin, code)
+        key ^= PIECE_KEYS[code][origin]
+        score -= sign * scores[piece_type][origin]
+        if captured:
+            self.remove(target, captured)
+            key ^= PIECE_KEYS[captured][target]
+            score += sign * scores[captured & 7][target]
+            halfmove = 0
+            if captured & 7 == chess.PAWN:
+                self.pawn_key ^= PIECE_KEYS[captured][target]
+
+        ep_square = None
+        if piece_type == chess.PAWN:
+            halfmove = 0
+            pawn_key = self.pawn_key ^ PIECE_KEYS[code][origin]
+            if target == self.ep_square:
+                victim = target - 8 if turn == chess.WHITE else target + 8
+                self.remove(victim, mailbox[victim])
+                key ^= PIECE_KEYS[chess.PAWN | (not turn) << 3][victim]
+                pawn_key ^= PIECE_KEYS[chess.PAWN | (not turn) << 3][victim]
+                score += sign * scores[chess.PAWN][victim]
+            elif abs(target - origin) == 16:
+                ep_square = (origin + target) // 2
+            if promotion:
+                code = promotion | turn << 3
+                piece_type = promotion
+            else:
+                pawn_key ^= PIECE_KEYS[code][target]
+            self.pawn_key = pawn_key
+        elif piece_type == chess.KING and abs(target - origin) == 2:
+            rook_origin, rook_target = (target + 1, target - 1) if target > origin else (target - 2, target + 1)
+            rook = mailbox[rook_origin]
+            self.remove(rook_origin, rook)
+            self.put(rook_target, rook)
+            key ^= PIECE_KEYS[rook][rook_origin] ^ PIECE_KEYS[rook][rook_target]
+            score += sign * (scores[chess.ROOK][rook_target] - scores[chess.ROOK][rook_origin])
+
+        self.put(target, code)
+        key ^= PIECE_KEYS[code][target]
+        score += sign * scores[piece_type][target]
+
+        self.castling &= CASTLING_MASKS[origin] & CASTLING_MASKS[target]
+        self.ep_square = ep_square
+        self.turn = not turn
+        self.ep_key = self.ep_hash()
+        self.key = key ^ CASTLING_KEYS[self.castling] ^ self.ep_key
+        self.score = score
+        self.halfmove = halfmove
+
+        if self.is_attacked(not turn, self.king(turn)):
+            self.unmake()
+            return False
+        return True
+
+    def unmake(self) -> None:
+        move, captured, self.castling, ep_square, self.ep_key, self.halfmove, self.key, self.pawn_key, self.score = self.stack.pop()
+        self.history.pop()
+        self.ep_square = ep_square
+        self.turn = turn = not self.turn
+        origin = move & 63
+        target = move >> 6 & 63
+        code = self.mailbox[target]
+        self.remove(target, code)
+        if move >> 12:
+            code = chess.PAWN | turn << 3
+        self.put(origin, code)
+        if captured:
+            self.put(target, captured)
+        elif code & 7 == chess.PAWN and target == ep_square:
+            self.put(target - 8 if turn == chess.WHITE else target + 8, chess.PAWN | (not turn) << 3)
+        elif code & 7 == chess.KING and abs(target - origin) == 2:
+            rook_origin, rook_target = (target + 1, target - 1) if target > origin else (target - 2, target + 1)
+            rook = self.mailbox[rook_target]
+            self.remove(rook_target, rook)
+            self.put(rook_origin, rook)
+
+    def make_null(self) -> None:
+        """Předá tah soupeři bez tahu (pro prořezávání nulovým tahem)."""
+        self.stack.append((0, 0, self.castling, self.ep_square, self.ep_key, self.halfmove, self.key, self.pawn_key, self.score))
+        self.history.append(self.key)
+        self.key ^= self.ep_key ^ TURN_KEY
+        self.ep_square = None
+        self.ep_key = 0
+        self.turn = not self.turn
+        self.halfmove += 1
+
+    def unmake_null(self) -> None:
+        _, _, self.castling, self.ep_square, self.ep_key, self.halfmove, self.key, self.pawn_key, self.score = self.stack.pop()
+        self.history.pop()
+        self.turn = not self.turn
+
+    def legal_moves(self) -> list[int]:
+        legal = []
+        for move in self.moves():
+            if self.make(move):
+                self.unmake()
+                legal.append(move)
+        return legal
+
+    def is_repetition(self) -> bool:
+        """Pozice se od posledního nevratného tahu už vyskytla (pro prohledávání stačí jednou)."""
+        history = self.history
+        for index in range(len(history) - 2, max(len(history) - self.halfmove, 0) - 1, -2):
+            if history[index] == self.key:
+                return True
+        return False
+
+    def is_insufficient_material(self) -> bool:
+        types = self.types
+        if types[chess.PAWN] | types[chess.ROOK] | types[chess.QUEEN]:
+            return False
+        minors = types[chess.KNIGHT] | types[chess.BISHOP]
+        if chess.popcount(minors) <= 1:
+            return True
+        return not types[chess.KNIGHT] and not (types[chess.BISHOP] & chess.BB_DARK_SQUARES and types[chess.BISHOP] & chess.BB_LIGHT_SQUARES)
+
+    def perft(self, depth: int) -> int:
+        """Počet listů stromu legálních tahů, pro kontrolu generátoru proti python-chess."""
+        if depth == 0:
+            return 1
+        nodes = 0
+        for move in self.moves():
+            if self.make(move):
+                nodes += self.perft(depth - 1)
+                self.unmake()
+        return nodes
@@ -2,168 +2,64 @@ import pygame
 import logging as log
 from common import *
 
-class DifficultyMenu:
+class DifficultyMenu(Menu):
+    title = "Select Difficulty:"
+
     def __init__(self):
         # Inicializace možností obtížnosti a nápověd
-        self.options = ["Easy", "Medium", "Hard", "Fales", "Return"]
-        self.help_texts = [
+        super().__init__(["Easy", "Medium", "Hard", "Fales", "Return"], [
             "AI does random moves..",  # Popis pro Easy
             "AI tries to hold middle squares.",  # Popis pro Medium
             "AI is aggressive.",  # Popis pro Hard
             "You can pray for Fales's mercy.",  # Popis pro Fales
             "Go back to the main menu."  # Popis pro Return
-        ]
-        self.selected_option = 0  # Index aktuálně vybrané možnosti
-        # Nastavení fontů pro titulek a možnosti
-        self.font_title = pygame.font.Font(None, 64)
-        self.font_option = pygame.font.Font(None, 50)
-        self.font_help = pygame.font.Font(None, 30)
-        # Nastavení barev pro pozadí, text a možnosti
-        self.shadow_color = (128, 119, 97)
-        self.highlight_color = (187, 250, 245)
-        self.font_color = (130, 179, 175)
-        self.easy_color = (51, 204, 51)  # Zelená pro Easy
-        self.medium_color = (227, 148, 39)  # Oranžová pro Medium
-        self.hard_color = (217, 46, 68)  # Červená pro Hard
-        self.fales_color = (149, 56, 161)  # Fialová pro Fales
-        self.background_color = (222, 210, 177)  # Barva pozadí
-
-    def draw(self, screen: pygame.Surface, width: int, height: int):
-        # Vyplnění obrazovky barvou pozadí
-        screen.fill(self.background_color)
-
-        # Renderování titulku
-        title_surface = self.font_title.render("Select Difficulty:", True, self.font_color)
-        title_shadow = self.font_title.render("Select Difficulty:", True, self.shadow_color)
-        title_rect = title_surface.get_rect(center=(width // 2, height // 4))
-        screen.blit(title_shadow, title_rect.move(3, 3))  # Vytvoření stínu titulku
-        screen.blit(title_surface, title_rect)
-
-        # Posun nápovědy dolů, aby se nezasahovalo do položky "Return"
-        help_color = self.font_color  # Výchozí barva pro nápovědu
-        if self.options[self.selected_option] == "Fales":
-            help_color = self.fales_color  # Fialová barva pro popisek Fales
-        elif self.options[self.selected_option] == "Easy":
-            help_color = self.easy_color  # Zelená barva pro popisek Easy
-        elif self.options[self.selected_option] == "Medium":
-            help_color = self.medium_color  # Oranžová barva pro popisek Medium
-        elif self.options[self.selected_option] == "Hard":
-            help_color = self.hard_color  # Červená barva pro popisek Hard
-
-        help_surface = self.font_help.render(self.help_texts[self.selected_option], True, help_color)
-        help_rect = help_surface.get_rect(center=(width // 2, height // 1.07))
-        screen.blit(help_surface, help_rect)
-
-        option_height = height // (len(self.options) + 1)
-        spacing = option_height * 0.5  # Nastavení mezery mezi možnostmi
-
-        for index, option in enumerate(self.options):
-            # Nastavení barvy podle vybrané možnosti
-            if option == "Easy":
-                color = self.easy_color if index == self.selected_option else self.font_color
-            elif option == "Medium":
-                color = self.medium_color if index == self.selected_option else self.font_color
-            elif option == "Hard":
-                color = self.hard_color if index == self.selected_option else self.font_color
-            elif option == "Fales":
-                color = self.fales_color if index == self.selected_option else self.font_color
-            elif option == "Return":
-                color = self.highlight_color if index == self.selected_option else self.font_color  # Zvýraznění Return
-            else:
-                color = self.font_color  # Výchozí barva
-
-            # Renderování možnosti s efektem stínu
-            option_surface = self.font_option.render(option, True, color)
-            option_shadow = self.font_option.render(option, True, self.shadow_color)
-            option_rect = option_surface.get_rect(center=(width // 2, height // 2 + index * spacing))
-
-            # Upravujeme pozici pro Return
-            if option == "Return":
-                option_rect.y += 20  # Posunout Return o 20 pixelů níže
-
-            # Zobrazení textu na obrazovce
-            screen.blit(option_shadow, option_rect.move(3, 3))
-            screen.blit(option_surface, option_rect)
-
-    def move_selection(self, direction):
-        # Posunutí vybrané možnosti
-        self.selected_option = (self.selected_option + direction) % len(self.options)
-
-    def handle_input(self, events: tuple[pygame.event.Event, ...], width: int, height: int):
-        for event in events:
-            if event.type == pygame.QUIT:
-                log.info("Exiting")  # Logování události ukončení
-                return "exit"
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP:
-                    self.move_selection(-1)  # Posun nahoru
-                elif event.key == pygame.K_DOWN:
-                    self.move_selection(1)  # Posun dolů
-                elif event.key == pygame.K_RETURN:
-                    return self.selected_option  # Potvrzení výběru
-            if event.type == pygame.MOUSEMOTION:
-                mouse_x, mouse_y = event.pos
-                for index in range(len(self.options)):
-                    if self.options[index] == "Return":
-                        option_rect = self.font_option.render(self.options[index], True, self.font_color).get_rect(center=(width // 2, (height // 2 + index * (height // (len(self.options) + 1)) * 0.5)+20))
-                    else:
-                        option_rect = self.font_option.render(self.options[index], True, self.font_color).get_rect(center=(width // 2, height // 2 + index * (height // (len(self.options) + 1)) * 0.5))
-                    if option_rect.collidepoint(mouse_x, mouse_y):
-                        self.selected_option = index  # Nastavení vybrané možnosti na základě pohybu myši
-                        break
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:  # Levé tlačítko myši
-                    mouse_x, mouse_y = event.pos
-                    for index in range(len(self.options)):
-                        if self.options[index] == "Return":
-                            option_rect = self.font_option.render(self.options[index], True, self.font_color).get_rect(center=(width // 2, (height // 2 + index * (height // (len(self.options) + 1)) * 0.5)+20))
-                        else:
-                            option_rect = self.font_option.render(self.options[index], True, self.font_color).get_rect(center=(width // 2, height // 2 + index * (height // (len(self.options) + 1)) * 0.5))
-                        if option_rect.collidepoint(mouse_x, mouse_y):
-                            self.selected_option = index  # Nastavení vybrané možnosti na základě kliknutí
-                            return self.selected_option
-        return None  # Pokud nebyla provedena žádná akce
-
-class PauseMenu:
+        ])
+        # Barvy vybrané obtížnosti, Return se zvýrazní výchozí barvou
+        self.difficulty_colors = {
+            "Easy": (51, 204, 51),  # Zelená pro Easy
+            "Medium": (227, 148, 39),  # Oranžová pro Medium
+            "Hard": (217, 46, 68),  # Červená pro Hard
+            "Fales": (149, 56, 161)  # Fialová pro Fales
+        }
+
+    def option_center(self, index: int, width: int, height: int) -> tuple[float, float]:
+        x, y = super().option_center(index, width, height)
+        return x, y + 20 if self.options[index] == "Return" else y  # Posunout Return o 20 pixelů níže
+
+    def option_color(self, index: int) -> tuple[int, int, int]:
+        if index == self.selected_option:
+            return self.difficulty_colors.get(self.options[index], self.highlight_color)
+        return self.font_color
+
+    def help_color(self) -> tuple[int, int, int]:
+        # Nápověda má barvu vybrané obtížnosti
+        return self.difficulty_colors.get(self.options[self.selected_option], self.font_color)
+
+class PauseMenu(Menu):
     def __init__(self):
-        # Definice možností menu pauzy
-        self.options = ["Return", "Exit"]
-        self.selected_option = 0
-        # Nastavení fontů a barev
-        self.font_option = pygame.font.Font(None, 50)
-        self.highlight_color = (187, 250, 245)
-        self.font_color = (130, 179, 175)
+        # Definice možností menu pauzy, bez titulku, stínů a nápověd
+        super().__init__(["Return", "Exit"])
+        self.shadow_color = None
         self.background_color = (50, 50, 50)  # Tmavá barva pozadí pro pauzované menu
+        self.snapshot = None  # Obrazovka hry ve chvíli pozastavení
+
+    def pause(self, screen: pygame.Surface) -> None:
+        """Zapamatuje si obrazovku hry, překryv se pak skládá jen jednou."""
+        self.snapshot = screen.copy()
+        self.invalidate()
+
+    def option_center(self, index: int, width: int, height: int) -> tuple[float, float]:
+        return width // 2, height // 2 + index * (height // 10)
 
-    def draw(self, screen: pygame.Surface, width: int, height: int):
-        # Vykreslení překryvného pozadí
+    def draw_background(self, surface: pygame.Surface, width: int, height: int) -> None:
+        surface.fill(self.background_color)
+        if self.snapshot:
+            surface.blit(self.snapshot, (0, 0))
+        # Poloprůhledný překryv přes zastavenou hru
         overlay = pygame.Surface((width, height))
         overlay.set_alpha(200)  # Průhlednost pozadí
         overlay.fill(self.background_color)
-        screen.blit(overlay, (0, 0))
-
-        # Vykreslení možností menu pauzy
-        spacing = height // 10
-        for index, option in enumerate(self.options):
-            color = self.highlight_color if index == self.selected_option else self.font_color
-            option_surface = self.font_option.render(option, True, color)
-            option_rect = option_surface.get_rect(center=(width // 2, height // 2 + index * spacing))
-            screen.blit(option_surface, option_rect)
-
-    def move_selection(self, direction):
-        # Posun mezi možnostmi v menu pauzy
-        self.selected_option = (self.selected_option + direction) % len(self.options)
-
-    def handle_input(self, events: tuple[pygame.event.Event, ...]):
-        for event in events:
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP:
-                    self.move_selection(-1)
-                elif event.key == pygame.K_DOWN:
-                    self.move_selection(1)
-                elif event.key == pygame.K_RETURN:
-                    return self.selected_option  # Návrat vybrané možnosti
-        return None
+        surface.blit(overlay, (0, 0))
 
 def main(debug=False):
     global logger
@@ -182,7 +78,7 @@ def main(debug=False):
     pause_menu = PauseMenu()  # Vytvoření instance pauzovacího menu
 
     while run:
-        events = pygame.event.get()
+        events = next_events(clock, 0 if menu.drawn is None else None)
         for event in events:
             if event.type == pygame.QUIT:
                 logger.info("Exiting")
@@ -197,6 +93,9 @@ def main(debug=False):
             width = 960
             height = 700
             screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
+            menu.invalidate()
+        if any(event.type in REDRAW_EVENTS for event in events):
+            menu.invalidate()
 
         menu_result = menu.handle_input(events, width, height)
         if menu_result is not None:
@@ -218,18 +117,19 @@ def main(debug=False):
             run = False
 
         if run:
-            menu.draw(screen, width, height)
-            pygame.display.update()
+            pygame.display.update(menu.draw(screen, width, height))  # Kreslí se jen po změně výběru nebo okna
 
     run = True
     game = Game(screen, board, images)
     game.players["black"] = AI(chess.BLACK, selected_difficulty)
 
     while run:
-        events = pygame.event.get()
+        # Spí, dokud nepřijde vstup, tah AI nebo časovač animace, neplatná obrazovka se kreslí hned
+        events = next_events(clock, 0 if game.renderer.redraw_all and not paused else None)
         for event in events:
             if event.type == pygame.QUIT:
                 run = False
+                game.stop()
                 pygame.quit()
                 return
             elif event.type == pygame.KEYDOWN:
@@ -237,6 +137,9 @@ def main(debug=False):
                     run = False
                 elif event.key == pygame.K_TAB:
                     paused = not paused  # Pauza hry při stisknutí Tab
+                    game.renderer.invalidate()  # Menu pauzy překreslilo celou obrazovku
+                    if paused:
+                        pause_menu.pause(screen)
 
         # Kontrola minimální velikosti okna ve hře
         width, height = screen.get_size()
@@ -244,23 +147,27 @@ def main(debug=False):
             width = 960
             height = 700
             screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
+            game.renderer.invalidate()
+            pause_menu.invalidate()
 
         if paused:
+            if any(event.type in REDRAW_EVENTS for event in events):
+                pause_menu.invalidate()
             pause_result = pause_menu.handle_input(events)
             if pause_result == 0:  # Return
                 paused = False  # Návrat do hry
+                game.renderer.invalidate()
             elif pause_result == 1:  # Exit
                 run = False  # Ukončení hry
+                game.stop()
                 pygame.quit()
                 return
 
-            pause_menu.draw(screen, width, height)  # Vykreslení pauzovacího menu
+            pygame.display.update(pause_menu.draw(screen, width, height))  # Vykreslení pauzovacího menu
         else:
-            game.loop(events)  # Aktualizace hry
-
-        pygame.display.update()
-        clock.tick(60)
+            pygame.display.update(game.loop(events))  # Aktualizace hry, překreslí se jen změněné části
 
+    game.stop()  # Escape, výpočet AI nesmí přežít hru
     pygame.quit()
 
     
@@ -0,0 +1,219 @@
+import argparse
+import logging as log
+import multiprocessing
+import os
+import sys
+import threading
+import time
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # Uvítání pygame by na stdout rozbilo protokol
+from common import *
+
+# Rozhraní UCI pro AI Fales: python uci.py, příkazy na stdin, odpovědi na stdout.
+# Hodnocení AI je v setinách pěšce jako v UCI.
+
+class UciEngine:
+    """Obsluha příkazů UCI nad AI Fales, prohledávání běží ve vlastním vlákně."""
+    def __init__(self, output=sys.stdout) -> None:
+        self.output  = output
+        self.board   = chess.Board()
+        self.options = {"Hash": TT_SIZE_MB, "Threads": SEARCH_WORKERS, "OwnBook": True}
+        self.ai      = None
+        self.search_thread = None
+        self.infinite      = False  # bestmove se smí poslat až po stop (go infinite, go ponder)
+        self.output_lock   = threading.Lock()
+
+    def send(self, line: str) -> None:
+        with self.output_lock:
+            print(line, file=self.output, flush=True)
+
+    def handle(self, line: str) -> bool:
+        """Zpracuje jeden řádek, vrací False po příkazu quit."""
+        tokens = line.split()
+        if not tokens:
+            return True
+        try:
+            return self.dispatch(tokens[0], tokens[1:])
+        except (ValueError, IndexError) as error:
+            # Chybný řádek od GUI nesmí ukončit engine, zahodí se a čte se dál
+            print(f"Invalid UCI command: {line.strip()} ({error})", file=sys.stderr, flush=True)
+            return True
+
+    def dispatch(self, command: str, arguments: list[str]) -> bool:
+        if command == "uci":
+            self.send("id name Czess Fales")
+            self.send("id author Czess")
+            self.send(f"option name Hash type spin default {TT_SIZE_MB} min 1 max 1024")
+            self.send(f"option name Threads type spin default {SEARCH_WORKERS} min 1 max 64")
+            self.send("option name OwnBook type check default true")
+            self.send("uciok")
+        elif command == "isready":
+            self.engine()
+            self.send("readyok")
+        elif command == "setoption":
+            self.set_option(arguments)
+        elif command == "ucinewgame":
+            self.stop()
+            if self.ai:
+                self.ai.tt.clear()
+        elif command == "position":
+            self.stop()
+            self.set_position(arguments)
+        elif command == "go":
+            self.stop()
+            self.go(arguments)
+        elif command == "stop":
+            self.stop()
+        elif command == "ponderhit":
+            self.ponderhit()
+        elif command == "quit":
+            self.stop()
+            if self.ai:
+                self.ai.close()
+            return False
+        else:
+            logger.debug(f"Unknown UCI command: {command}")
+        return True
+
+    def engine(self) -> "AI":
+        """AI se vytváří líně, po změně voleb znovu."""
+        if self.ai is None:
+            self.ai = AI(self.board.turn, "Fales", tt_size_mb=self.options["Hash"], workers=self.options["Threads"],
+                         book_path=BOOK_PATH if self.options["OwnBook"] else None)
+            self.ai.on_iteration = self.report
+        return self.ai
+
+    def set_option(self, arguments: list[str]) -> None:
+        # setoption name <jméno> [value <hodnota>], jméno i hodnota mohou mít mezery
+        text = " ".join(arguments)
+        name, _, value = text.partition(" value ")
+        name = name.removeprefix("name ").strip()
+        if name not in self.options:
+            logger.debug(f"Unknown UCI option: {name}")
+            return
+        if isinstance(self.options[name], bool):
+            self.options[name] = value.strip().lower() == "true"
+        else:
+            self.options[name] = int(value)
+        self.stop()
+        if self.ai:
+            self.ai.close()
+            self.ai = None
+
+    def set_position(self, arguments: list[str]) -> None:
+        # position startpos|fen <FEN> [moves <tahy>]
+        if "moves" in arguments:
+            index = arguments.index("moves")
+            arguments, moves = arguments[:index], arguments[index + 1:]
+        else:
+            moves = []
+        # Nová pozice se sestaví celá, chybný tah nenechá rozpracovanou
+        board = chess.Board(" ".join(arguments[1:])) if arguments and arguments[0] == "fen" else chess.Board()
+        for move in moves:
+            board.push_uci(move)
+        self.board = board
+
+    def go(self, arguments: list[str]) -> None:
+        parameters = {}
+        flags = set()
+        index = 0
+        while index < len(arguments):
+            if arguments[index] in ("infinite", "ponder"):
+                flags.add(arguments[index])
+                index += 1
+            elif arguments[index] == "searchmoves":
+                break  # Omezení kořenových tahů nepodporujeme
+            else:
+                parameters[arguments[index]] = int(arguments[index + 1])
+                index += 2
+
+        ai = self.engine()
+        if ai.color != self.board.turn:
+            ai.color = self.board.turn
+            ai.tt.clear()  # Hodnoty v tabulce jsou z pohledu AI, po změně strany neplatí
+        ai.time_limit = self.time_budget(parameters, flags)
+        ai.node_limit = parameters.get("nodes", float("inf") if ai.time_limit == float("inf") else MOVE_BUDGETS["Fales"][1])
+        max_depth = min(parameters.get("depth", MAX_DEPTH), MAX_DEPTH)
+        self.infinite = bool(flags)
+        ai.stop_event.clear()
+        ai.pondering = "ponder" in flags
+        self.search_thread = threading.Thread(target=self.search, args=(self.board.copy(), max_depth), daemon=True)
+        self.search_thread.start()
+
+    def time_budget(self, parameters: dict[str, int], flags: set[str]) -> float:
+        """Sekundy na tah podle příkazu go."""
+        if "movetime" in parameters:
+            return parameters["movetime"] / 1000
+        remaining = parameters.get("wtime" if self.board.turn == chess.WHITE else "btime")
+        if remaining is None:
+            if flags or "depth" in parameters or "nodes" in parameters:
+                return float("inf")
+            return MOVE_BUDGETS["Fales"][0]
+        increment = parameters.get("winc" if self.board.turn == chess.WHITE else "binc", 0)
+        moves_to_go = parameters.get("movestogo", 30)
+        # Rovnoměrný díl zbývajícího času a většina přídavku, nikdy víc než polovina hodin
+        return max(0.01, min(remaining / moves_to_go + increment * 0.75, remaining / 2) / 1000)
+
+    def search(self, board: chess.Board, max_depth: int) -> None:
+        """Tělo vlákna: tah z knihovny nebo tabulek koncovek, jinak prohledávání, a nakonec bestmove."""
+        ai = self.ai
+        move = None if ai.pondering else ai.book_move(board) or ai.bitbase_move(board)
+        searched = not move
+        if move:
+            ai.pv = [move]
+            self.send("info string book or endgame table move")
+        elif ai.workers > 1:
+            move = ai.parallel_search(board, max_depth)
+        else:
+            move = ai.search(board, max_depth)
+        while self.infinite and not ai.stop_event.is_set():
+            ai.stop_event.wait(0.01)  # UCI nedovolí poslat bestmove dřív než stop nebo ponderhit
+
+        if searched:  # Počty uzlů a čas ještě patří minulému hledání, když tah přišel z knihovny
+            elapsed = time.perf_counter() - ai.started
+            self.send(f"info nodes {ai.nodes} nps {int(ai.nodes / elapsed) if elapsed else 0} time {int(elapsed * 1000)}")
+        if move is None:
+            self.send("bestmove 0000")
+        elif len(ai.pv) > 1 and ai.pv[0] == move:
+            self.send(f"bestmove {move.uci()} ponder {ai.pv[1].uci()}")
+        else:
+            self.send(f"bestmove {move.uci()}")
+
+    def report(self, depth: int, value: int, pv: list[chess.Move]) -> None:
+        """info řádek po každé dokončené iteraci."""
+        ai = self.ai
+        elapsed = time.perf_counter() - ai.started
+        if abs(value) >= MATE_VALUE:
+            moves = (len(pv) + 1) // 2  # Vzdálenost matu neukládáme, odhadne se z délky varianty
+            score = f"mate {moves if value > 0 else -moves}"
+        else:
+            score = f"cp {value}"
+        self.send(f"info depth {depth} score {score} nodes {ai.nodes} nps {int(ai.nodes / elapsed) if elapsed else 0} "
+                  f"time {int(elapsed * 1000)} pv {' '.join(move.uci() for move in pv)}")
+
+    def ponderhit(self) -> None:
+        """Soupeř zahrál očekávaný tah, přemýšlení pokračuje jako normální hledání."""
+        ai = self.ai
+        if ai and ai.pondering:
+            ai.deadline = max(time.perf_counter(), ai.started + ai.time_limit)
+            ai.pondering = False
+            self.infinite = False
+
+    def stop(self) -> None:
+        if self.search_thread is not None:
+            self.ai.stop_event.set()
+            self.search_thread.join()
+            self.search_thread = None
+
+def main(debug=False):
+    if debug:
+        log.basicConfig(level=log.DEBUG, stream=sys.stderr, format='%(asctime)s - [%(name)s] - %(levelname)s - %(message)s')
+    engine = UciEngine()
+    for line in sys.stdin:
+        if not engine.handle(line):
+            break
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Pomocné procesy AI v zabaleném exe
+    parser = argparse.ArgumentParser(description="Czess Fales AI over the UCI protocol.")
+    parser.add_argument("--debug", action="store_true", help="log the search to stderr")
+    main(parser.parse_args().debug)
@@ -0,0 +1,58 @@
+import argparse
+import sys
+
+import positions  # noqa: F401 (puts src/ on the import path)
+
+import chess
+from common import AI, BITBASE_PATH
+
+# Won positions where a careless move stalemates the opponent: (FEN, difficulties that must avoid it)
+STALEMATE_TRAPS = [
+    ("4k3/2p5/8/2Q5/8/8/1K6/5R2 w - - 0 1", ["hard", "Fales"]),  # Qxc7 is stalemate
+    ("8/8/8/K2R4/8/2k5/p4Q2/8 w - - 0 1", ["hard", "Fales"]),    # Qxa2 is stalemate
+    ("2k5/p4Q2/8/8/3R4/3K4/8/8 w - - 0 1", ["hard", "Fales"]),   # Qxa7 is stalemate
+]
+
+# Endgame table positions: (FEN, whether the table picks the move, otherwise the search must)
+BITBASE_POSITIONS = [
+    ("8/8/8/4k3/8/8/8/4K3 w - - 0 1", False),    # Bare kings
+    ("8/8/8/4k3/8/8/3B4/4K3 w - - 0 1", False),  # King and bishop cannot mate
+    ("8/8/8/4k3/8/8/3N4/4K3 b - - 0 1", False),  # King and knight, the weaker side to move
+    ("4k3/8/4P3/4K3/8/8/8/8 w - - 0 1", False),  # Drawn king and pawn ending
+    ("8/8/8/4k3/8/8/3Q4/4K3 w - - 0 1", True),   # Won with the queen
+]
+
+def main():
+    parser = argparse.ArgumentParser(description="Check AI moves in positions where earlier versions went wrong.")
+    parser.add_argument("--time", type=float, default=0.5, help="seconds per move of the Fales AI (default: 0.5)")
+    args = parser.parse_args()
+
+    failures = 0
+    for fen, difficulties in STALEMATE_TRAPS:
+        for difficulty in difficulties:
+            board = chess.Board(fen)
+            ai = AI(board.turn, difficulty, book_path=None, bitbase_path=None)
+            ai.time_limit = args.time
+            move = getattr(ai, f"{difficulty.lower()}_move")(board.copy())
+            ai.close()
+            board.push(move)
+            stalemate = board.is_stalemate() or board.is_insufficient_material()
+            failures += stalemate
+            print(f"{difficulty:<6} {fen:<40} {move.uci():<6} {'STALEMATE' if stalemate else 'ok'}")
+    ai = AI(chess.WHITE, "Fales", bitbase_path=BITBASE_PATH, book_path=None)
+    if ai.bitbase:
+        for fen, from_table in BITBASE_POSITIONS:
+            move = ai.bitbase_move(chess.Board(fen))
+            wrong = (move is not None) != from_table
+            failures += wrong
+            source = "bitbase" if move else "search"
+            print(f"bitbase {fen:<40} {source:<7} {'WRONG' if wrong else 'ok'}")
+    else:
+        print(f"bitbase not found at {BITBASE_PATH}, skipping its positions")
+    ai.close()
+    if failures:
+        print(f"{failures} failed positions")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from positions import PERFT, POSITIONS
+
+import chess
+from common import AI, MOVE_BUDGETS, SQUARE_SCORES
+from search_board import SearchBoard
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+def best_time(function, repeat: int) -> float:
+    """The fastest of several runs, the slower ones are mostly noise from the rest of the machine."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def bench_perft(repeat: int) -> dict[str, dict]:
+    results = {}
+    for name, fen, depth, expected in PERFT:
+        position = SearchBoard.from_board(chess.Board(fen), SQUARE_SCORES)
+        nodes = position.perft(depth)
+        if nodes != expected:
+            raise AssertionError(f"perft {name} depth {depth}: {nodes} nodes, expected {expected}")
+        seconds = best_time(lambda: position.perft(depth), repeat)
+        results[f"perft/{name}"] = {"depth": depth, "nodes": nodes, "seconds": seconds, "throughput": nodes / seconds, "unit": "nodes/s"}
+    return results
+
+def bench_search(depth: int, moves: int, repeat: int) -> dict[str, dict]:
+    """Fales searches to a fixed depth, the other difficulties pick a move per position over and over,
+    a single one-ply move is too quick to time."""
+    results = {}
+    for difficulty in MOVE_BUDGETS:
+        nodes, seconds = 0, 0.0
+        for fen in POSITIONS:
+            board = chess.Board(fen)
+            ai = AI(board.turn, difficulty, book_path=None, bitbase_path=None)
+            ai.time_limit, ai.node_limit = float("inf"), float("inf")
+            if difficulty == "Fales":
+                # Start every run from an empty table, the repeats would only read the first result otherwise
+                run = lambda: (ai.tt.clear(), ai.search(board, depth))
+            else:
+                run = lambda: [getattr(ai, f"{difficulty}_move")(board) for _ in range(moves)]
+            seconds += best_time(run, repeat)
+            nodes += ai.nodes if difficulty == "Fales" else ai.nodes * moves
+            ai.close()
+        if nodes:
+            results[f"search/{difficulty}"] = {"depth": depth if difficulty == "Fales" else 1, "nodes": nodes, "seconds": seconds,
+                                               "throughput": nodes / seconds, "unit": "nodes/s"}
+        else:  # The random difficulties do not count nodes
+            results[f"search/{difficulty}"] = {"moves": moves * len(POSITIONS), "seconds": seconds,
+                                               "throughput": moves * len(POSITIONS) / seconds, "unit": "moves/s"}
+    return results
+
+def bench_evaluation(count: int, repeat: int) -> dict[str, dict]:
+    """evaluate_board over python-chess boards and the incremental evaluate used inside the search."""
+    boards = [chess.Board(fen) for fen in POSITIONS]
+    positions = [SearchBoard.from_board(board, SQUARE_SCORES) for board in boards]
+    ai = AI(chess.WHITE, "Fales", book_path=None, bitbase_path=None)
+    calls = count * len(POSITIONS)
+
+    def evaluate_boards():
+        for _ in range(count):
+            for board in boards:
+                ai.evaluate_board(board)
+
+    def evaluate_positions():
+        for _ in range(count):
+            ai.pawn_table = [None] * len(ai.pawn_table)  # Without the pawn hash only the first call would be measured
+            for position in positions:
+                ai.evaluate(position)
+
+    results = {}
+    for name, function in (("evaluate_board", evaluate_boards), ("evaluate", evaluate_positions)):
+        seconds = best_time(function, repeat)
+        results[f"eval/{name}"] = {"calls": calls, "seconds": seconds, "throughput": calls / seconds, "unit": "calls/s"}
+    ai.close()
+    return results
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    """Return the benchmarks whose throughput dropped more than the threshold below the baseline."""
+    regressions = []
+    print(f"\n{'benchmark':<24} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<24} {'-':>12} {result['throughput']:>12.0f}")
+            continue
+        change = result["throughput"] / baseline[name]["throughput"] - 1
+        regressed = change < -threshold
+        print(f"{name:<24} {baseline[name]['throughput']:>12.0f} {result['throughput']:>12.0f} {change:>+8.1%}{'  REGRESSION' if regressed else ''}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Czess engine and compare the throughput against a saved baseline.")
+    parser.add_argument("--depth", type=int, default=3, help="fixed search depth of the Fales AI (default: 3)")
+    parser.add_argument("--moves", type=int, default=200, help="moves picked per position by the one-ply difficulties (default: 200)")
+    parser.add_argument("--evals", type=int, default=2000, help="evaluations of every position in the evaluation benchmark (default: 2000)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of every benchmark, the fastest one counts (default: 3)")
+    parser.add_argument("-o", "--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against (default: test/benchmark_baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed throughput drop before failing (default: 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    results = {}
+    for label, run in (("perft", lambda: bench_perft(args.repeat)),
+                       ("search", lambda: bench_search(args.depth, args.moves, args.repeat)),
+                       ("evaluation", lambda: bench_evaluation(args.evals, args.repeat))):
+        print(f"Running {label} benchmarks...")
+        for name, result in run().items():
+            results[name] = result
+            print(f"  {name:<22} {result['throughput']:>12.0f} {result['unit']} ({result['seconds']:.3f}s)")
+
+    report = {"python": platform.python_version(), "machine": platform.machine(), "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+              "settings": {"depth": args.depth, "moves": args.moves, "evals": args.evals, "repeat": args.repeat}, "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+        print(f"Results have been saved to: {args.output}")
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+        print(f"Baseline has been saved to: {args.baseline}")
+        return
+    if not os.path.isfile(args.baseline):
+        print(f"No baseline at {args.baseline}, create one with --save-baseline")
+        return
+
+    with open(args.baseline, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline["settings"] != report["settings"]:
+        print(f"Warning: baseline was measured with {baseline['settings']}, the numbers are not comparable")
+    regressions = compare(results, baseline["results"], args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print("\nNo regressions")
+
+if __name__ == "__main__":
+    main()
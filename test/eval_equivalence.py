@@ -0,0 +1,75 @@
+import argparse
+import random
+import sys
+
+from positions import POSITIONS
+
+import chess
+from common import AI, SQUARE_SCORES, encode_move
+from search_board import SearchBoard
+
+def check_position(ais: list[AI], board: chess.Board, position: SearchBoard) -> list[str]:
+    """Compare the incremental evaluation with evaluate_board for both colours, return the differences."""
+    errors = []
+    fresh = SearchBoard.from_board(board, SQUARE_SCORES)
+    if position.score != fresh.score:
+        errors.append(f"running material + PST sum {position.score}, rebuilt {fresh.score}")
+    if position.pawn_key != fresh.pawn_key:
+        errors.append("pawn key differs from the rebuilt one")
+    for ai in ais:
+        expected = ai.evaluate_board(board)
+        for name, evaluated in (("incremental", position), ("from_board", fresh)):
+            value = ai.evaluate(evaluated)
+            if value != expected:
+                errors.append(f"{name} evaluate for {chess.COLOR_NAMES[ai.color]} is {value}, evaluate_board {expected}")
+    return errors
+
+def play_game(ais: list[AI], fen: str, max_plies: int, rng: random.Random) -> tuple[int, list[str]]:
+    """Play random moves on a python-chess board and a SearchBoard side by side,
+    return (checked positions, failures). Unwinding the game checks unmake as well."""
+    board = chess.Board(fen)
+    position = SearchBoard.from_board(board, SQUARE_SCORES)
+    checked, failures = 0, []
+    while len(board.move_stack) < max_plies and not board.is_game_over():
+        move = rng.choice(list(board.legal_moves))
+        board.push(move)
+        if not position.make(encode_move(move)):
+            failures.append(f"{board.fen()}: SearchBoard rejected the legal move {move}")
+            return checked, failures
+        if board.is_game_over():
+            break  # evaluate_board scores mate and stalemate, the search handles them before evaluate
+        checked += 1
+        failures += [f"{board.fen()} after {move}: {error}" for error in check_position(ais, board, position)]
+    while board.move_stack:
+        board.pop()
+        position.unmake()
+        checked += 1
+        failures += [f"{board.fen()} after unmake: {error}" for error in check_position(ais, board, position)]
+    return checked, failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the incremental evaluation returns the same scores as evaluate_board.")
+    parser.add_argument("--games", type=int, default=50, help="random games to play (default: 50)")
+    parser.add_argument("--plies", type=int, default=200, help="longest game in plies (default: 200)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    ais = [AI(color, "Fales", book_path=None, bitbase_path=None) for color in chess.COLORS]
+    checked, failures = 0, []
+    for game in range(args.games):
+        count, errors = play_game(ais, POSITIONS[game % len(POSITIONS)], args.plies, rng)
+        checked += count
+        failures += errors
+    for ai in ais:
+        ai.close()
+
+    for failure in failures[:20]:
+        print(failure)
+    if failures:
+        print(f"{len(failures)} mismatches in {checked} positions")
+        sys.exit(1)
+    print(f"Incremental evaluation matches evaluate_board in {checked} positions of {args.games} games")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import argparse
+import os
+import time
+
+from positions import POSITIONS
+
+import chess
+from common import AI
+
+def time_to_depth(fen: str, depth: int, workers: int) -> float:
+    """Return the seconds the AI needs to finish an iteration of the given depth."""
+    board = chess.Board(fen)
+    ai = AI(board.turn, "Fales", workers=workers)
+    ai.time_limit, ai.node_limit = float("inf"), float("inf")
+    try:
+        if workers > 1:
+            ai.parallel_search(board.copy(), 1)  # Start the helper processes outside of the measurement
+            ai.tt.clear()
+        start = time.perf_counter()
+        if workers > 1:
+            ai.parallel_search(board, depth)
+        else:
+            ai.search(board, depth)
+        return time.perf_counter() - start
+    finally:
+        ai.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Lazy SMP time-to-depth scaling of the Fales AI.")
+    parser.add_argument("--depth", type=int, default=4, help="search depth to reach (default: 4)")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="highest worker count to measure")
+    args = parser.parse_args()
+
+    print(f"Time to depth {args.depth} on {len(POSITIONS)} positions")
+    print(f"{'workers':>7} {'total [s]':>10} {'speedup':>8}")
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        total = sum(time_to_depth(fen, args.depth, workers) for fen in POSITIONS)
+        baseline = baseline or total
+        print(f"{workers:>7} {total:>10.2f} {baseline / total:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import sys
+import time
+
+from positions import PERFT
+
+import chess
+import chess.polyglot
+from common import SQUARE_SCORES, decode_move, encode_move
+from search_board import SearchBoard
+
+# Positions aimed at the special moves, (name, FEN, depth); the leaf counts come from python-chess
+SPECIAL = [
+    ("castling", "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", 3),
+    ("castling through check", "r3k2r/8/8/8/8/8/6b1/R3K2R w KQkq - 0 1", 3),
+    ("en passant", "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3", 3),
+    ("pinned en passant", "8/8/8/KPp4r/8/8/8/7k w - c6 0 1", 4),
+    ("underpromotions", "n1n5/PPPk4/8/8/8/8/4Kppp/5N1N b - - 0 1", 3),
+    ("position 5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", 3),
+]
+
+def state(position: SearchBoard) -> tuple:
+    return (position.key, position.pawn_key, position.score, position.castling, position.ep_square, position.halfmove,
+            position.turn, tuple(position.mailbox), tuple(position.types), tuple(position.colors))
+
+def walk(board: chess.Board, position: SearchBoard, depth: int, failures: list[str]) -> int:
+    """Perft over python-chess and the SearchBoard side by side, compare the legal moves and Zobrist keys in every node."""
+    key = chess.polyglot.zobrist_hash(board)
+    if position.key != key:
+        failures.append(f"{board.fen()}: key {position.key:016x}, python-chess {key:016x}")
+    if depth == 0:
+        return 1
+    expected = {encode_move(move) for move in board.legal_moves}
+    legal = set(position.legal_moves())
+    if legal != expected:
+        missing = " ".join(decode_move(move).uci() for move in expected - legal)
+        extra = " ".join(decode_move(move).uci() for move in legal - expected)
+        failures.append(f"{board.fen()}: missing [{missing}], illegal [{extra}]")
+    before = state(position)
+    nodes = 0
+    for move in board.legal_moves:
+        board.push(move)
+        if position.make(encode_move(move)):
+            nodes += walk(board, position, depth - 1, failures)
+            position.unmake()
+        else:
+            failures.append(f"{board.fen()}: SearchBoard rejected the legal move {move}")
+        board.pop()
+        if state(position) != before:
+            failures.append(f"{board.fen()}: unmake of {move} did not restore the position")
+            break
+    return nodes
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the SearchBoard move generator and Zobrist keys against python-chess.")
+    parser.add_argument("--depth", type=int, help="override the depth of every position")
+    args = parser.parse_args()
+
+    failed = False
+    for name, fen, depth, expected in PERFT + [entry + (None,) for entry in SPECIAL]:
+        depth = args.depth or depth
+        board = chess.Board(fen)
+        position = SearchBoard.from_board(board, SQUARE_SCORES)
+        failures = []
+        start = time.perf_counter()
+        if args.depth:
+            expected = None  # The table counts hold only for the default depths
+        nodes = walk(board, position, depth, failures)
+        fast = position.perft(depth)
+        if fast != nodes or expected not in (None, nodes):
+            failures.append(f"perft {depth}: {fast} leaves, python-chess {nodes}, expected {expected or nodes}")
+        print(f"{name:<24} depth {depth} {nodes:>9} leaves {'ok' if not failures else 'FAILED'} ({time.perf_counter() - start:.1f}s)")
+        for failure in failures[:10]:
+            print(f"  {failure}")
+        failed = failed or bool(failures)
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
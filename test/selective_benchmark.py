@@ -0,0 +1,49 @@
+import argparse
+import time
+
+from positions import WAC_POSITIONS
+
+import chess
+from common import AI, MAX_DEPTH
+
+TECHNIQUES = ["null_move", "late_move_reductions", "futility_pruning", "check_extensions"]
+# Everything on, each technique switched off on its own, everything off
+CONFIGS = [("all on", {})] + [(f"no {name}", {name: False}) for name in TECHNIQUES] + \
+          [("all off", {name: False for name in TECHNIQUES})]
+
+def run(switches: dict[str, bool], depth: int, time_limit: float | None) -> tuple[int, float, float, float, int]:
+    """Search every position to the given depth (or for the given time),
+    return (nodes, seconds, average depth, first move cutoff rate, solved positions)."""
+    nodes, seconds, depths, cutoffs, first_cutoffs, solved = 0, 0.0, 0, 0, 0, 0
+    for epd in WAC_POSITIONS:
+        board, operations = chess.Board.from_epd(epd)
+        ai = AI(board.turn, "Fales", book_path=None, bitbase_path=None)
+        ai.time_limit, ai.node_limit = time_limit or float("inf"), float("inf")
+        for name, value in switches.items():
+            setattr(ai, name, value)
+        start = time.perf_counter()
+        move = ai.search(board, depth)
+        seconds += time.perf_counter() - start
+        nodes += ai.nodes
+        depths += ai.depth
+        cutoffs += ai.cutoffs
+        first_cutoffs += ai.first_cutoffs
+        solved += move in operations["bm"]
+        ai.close()
+    return nodes, seconds, depths / len(WAC_POSITIONS), first_cutoffs / max(cutoffs, 1), solved
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the selective search techniques of the Fales AI on a fixed position suite.")
+    parser.add_argument("--depth", type=int, default=4, help="search depth for every position (default: 4)")
+    parser.add_argument("--time", type=float, help="search each position for this many seconds instead of a fixed depth")
+    args = parser.parse_args()
+
+    depth = MAX_DEPTH if args.time else args.depth
+    print(f"{f'{args.time}s' if args.time else f'Depth {depth}'} per position on {len(WAC_POSITIONS)} positions")
+    print(f"{'config':<26} {'nodes':>10} {'time [s]':>9} {'depth':>6} {'1st cut':>8} {'solved':>7}")
+    for label, switches in CONFIGS:
+        nodes, seconds, average_depth, first_cutoff_rate, solved = run(switches, depth, args.time)
+        print(f"{label:<26} {nodes:>10} {seconds:>9.2f} {average_depth:>6.1f} {first_cutoff_rate:>8.1%} {solved:>4}/{len(WAC_POSITIONS)}")
+
+if __name__ == "__main__":
+    main()